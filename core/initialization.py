@@ -7,9 +7,14 @@ runtime components with simple dependency‑injection (DI) overrides.
 
 from __future__ import annotations
 
+import copy
 import os
+import sys
 import logging
-from typing import Dict, Optional
+import functools
+from collections.abc import Mapping
+from functools import cached_property
+from typing import Dict, Iterator, Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -25,142 +30,227 @@ from utils.config_manager import ConfigManager
 def load_configuration(env_path: str = "config.env") -> Dict:
     """
     Load settings from an .env-style file and return a structured config dict.
+
+    The parsed result is cached per (env_path, mtime): editing the file
+    invalidates the entry. Each call gets its own deep copy, so callers may
+    modify nested sections without affecting later calls.
     """
+    try:
+        mtime: Optional[float] = os.path.getmtime(env_path)
+    except OSError:
+        mtime = None
+    return copy.deepcopy(_load_configuration_cached(env_path, mtime))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_configuration_cached(env_path: str, mtime: Optional[float]) -> Dict:
     log = logging.getLogger(__name__)
-    load_dotenv(dotenv_path=env_path)  
-    log.debug("my_config_items:   %s", os.environ.items())
+    # override=True: after an edit (new mtime) the file's new values must
+    # replace what an earlier load already put into os.environ.
+    load_dotenv(dotenv_path=env_path, override=True)
 
-    symbols_raw = os.getenv("SYMBOLS", "")
-    timeframes_raw = os.getenv("TIMEFRAMES", "")
+    # Snapshot once; every lookup below is a plain dict hit.
+    env = dict(os.environ)
+
+    symbols_raw = env.get("SYMBOLS", "")
+    timeframes_raw = env.get("TIMEFRAMES", "")
 
     # Build timeframe code maps from env like REST_TIMEFRAME_CODES_1H=hour1
     ws_codes: Dict[str, str] = {}
     rest_codes: Dict[str, str] = {}
-    for key, val in os.environ.items():
-        if key.startswith("WEBSOCKET_TIMEFRAME_CODES_"):
-            raw_ws_tf = key.replace("WEBSOCKET_TIMEFRAME_CODES_", "").lower()
-            tf = normalize_tf(raw_ws_tf) 
-            ws_codes[tf] = val
-        elif key.startswith("REST_TIMEFRAME_CODES_"):
-            raw_rest_tf = key.replace("REST_TIMEFRAME_CODES_", "").lower()
-            tf = normalize_tf(raw_rest_tf) 
-            rest_codes[tf] = val
+    tf_prefixes = {
+        "WEBSOCKET_TIMEFRAME_CODES_": ws_codes,
+        "REST_TIMEFRAME_CODES_": rest_codes,
+    }
+    for key, val in env.items():
+        if key[:1] not in ("W", "R"):
+            continue
+        for prefix, codes in tf_prefixes.items():
+            if key.startswith(prefix):
+                codes[normalize_tf(key[len(prefix):].lower())] = val
+                break
     log.debug("WS map keys:   %s", list(ws_codes.keys()))
     log.debug("REST map keys: %s", list(rest_codes.keys()))
 
-    #new by chatGPT#conf["TIMEFRAMES"] = [normalize_tf(t.strip()) for t in timeframes_raw.split(",") if t.strip()]
     conf: Dict[str, object] = {
-        "SYMBOLS": [s.strip().lower() for s in symbols_raw.split(",") if s.strip()],
-        "TIMEFRAMES": [normalize_tf(t.strip()) for t in timeframes_raw.split(",") if t.strip()],
+        # Interned so the per-message dict/tuple-key lookups compare by identity.
+        "SYMBOLS": [
+            sys.intern(s) for s in (raw.strip().lower() for raw in symbols_raw.split(",")) if s
+        ],
+        "TIMEFRAMES": [
+            sys.intern(normalize_tf(t)) for t in (raw.strip() for raw in timeframes_raw.split(",")) if t
+        ],
         "WEBSOCKET_TIMEFRAME_CODES": ws_codes,
         "REST_TIMEFRAME_CODES": rest_codes,
 
         "TELEGRAM": {
-            "token": os.getenv("TELEGRAM_TOKEN"),
-            "chat_id": os.getenv("TELEGRAM_CHAT_ID"),
+            "token": env.get("TELEGRAM_TOKEN"),
+            "chat_id": env.get("TELEGRAM_CHAT_ID"),
         },
         "TWITTER": {
-            "api_key": os.getenv("TWITTER_API_KEY"),
-            "api_secret": os.getenv("TWITTER_API_SECRET"),
-            "access_token": os.getenv("TWITTER_ACCESS_TOKEN"),
-            "access_secret": os.getenv("TWITTER_ACCESS_SECRET"),
+            "api_key": env.get("TWITTER_API_KEY"),
+            "api_secret": env.get("TWITTER_API_SECRET"),
+            "access_token": env.get("TWITTER_ACCESS_TOKEN"),
+            "access_secret": env.get("TWITTER_ACCESS_SECRET"),
         },
         "LINKEDIN": {
-            "username": os.getenv("LINKEDIN_USERNAME"),
-            "password": os.getenv("LINKEDIN_PASSWORD"),
+            "username": env.get("LINKEDIN_USERNAME"),
+            "password": env.get("LINKEDIN_PASSWORD"),
         },
         "LBANK_API": {
-            "api_key": os.getenv("LBANK_API_API_KEY"),
-            "api_secret": os.getenv("LBANK_API_API_SECRET"),
-            "base_url": os.getenv("LBANK_API_BASE_URL", "https://api.lbank.info"),
-            "websocket_url": os.getenv("LBANK_API_WEBSOCKET_URL", ""),
+            "api_key": env.get("LBANK_API_API_KEY"),
+            "api_secret": env.get("LBANK_API_API_SECRET"),
+            "base_url": env.get("LBANK_API_BASE_URL", "https://api.lbank.info"),
+            "signature_method": env.get("LBANK_API_SIGNATURE_METHOD", "MD5"),
+            "websocket_url": env.get("LBANK_API_WEBSOCKET_URL", ""),
         },
         "ACCOUNT": {
-            "equity": float(os.getenv("ACCOUNT_EQUITY", "0") or 0),
+            "equity": float(env.get("ACCOUNT_EQUITY", "0") or 0),
         },
-        "WS_MAX_RETRIES": int(os.getenv("WS_MAX_RETRIES", "5")),
-        "DEPTH_LEVEL": int(os.getenv("DEPTH_LEVEL", "50")),
+        "WS_MAX_RETRIES": int(env.get("WS_MAX_RETRIES", "5")),
+        "DEPTH_LEVEL": int(env.get("DEPTH_LEVEL", "50")),
+        "WS_QUEUE_MAX": int(env.get("WS_QUEUE_MAX", "2048")),
+        "WS_MAX_BATCH": int(env.get("WS_MAX_BATCH", "64")),
+        "PREFILL_CONCURRENCY": int(env.get("PREFILL_CONCURRENCY", "8")),
+        # >0: indicator refreshes run in that many worker processes instead of threads.
+        "COMPUTE_PROCESSES": int(env.get("COMPUTE_PROCESSES", "0")),
+        "WS_BROADCAST_COMPRESSED": env.get("WS_BROADCAST_COMPRESSED", "false").lower() in ("1", "true", "yes"),
     }
 
     # Alias for legacy code that expects `rest_code_map`
     conf["rest_code_map"] = conf.get("REST_TIMEFRAME_CODES", {})
 
     # Optional debug
-    log = logging.getLogger(__name__)
     log.debug("Parsed SYMBOLS: %s", conf["SYMBOLS"])
     log.debug("Parsed TIMEFRAMES: %s", conf["TIMEFRAMES"])
 
     return conf
 
 
-def initialize_components(
-    config: Dict,
-    overrides: Optional[Dict[str, object]] = None,
-    logger: Optional[object] = None
-    ) -> Dict[str, object]:
+# Everything initialize_components can hand to WebSocketClient.
+_WS_CANDIDATES = ("config", "logger", "trader", "strategy", "data_provider", "message_callback")
+
+
+@functools.lru_cache(maxsize=None)
+def _ws_params() -> Tuple[str, ...]:
+    """Candidate kwargs that ``WebSocketClient.__init__`` accepts (resolved once)."""
+    import inspect
+
+    params = inspect.signature(WebSocketClient.__init__).parameters
+    return tuple(name for name in _WS_CANDIDATES if name in params)
+
+
+class _LazyComponents(Mapping):
     """
-    Construct and wire together all runtime components (supports DI via overrides).
+    Read-only mapping that builds each runtime component on first access.
 
-    Keys you can override:
-    {"logger", "strategy", "trader", "websocket_client", "data_provider"}
+    Construction order is implied by the dependencies between the factories
+    (the WebSocket client pulls in trader/strategy/logger), so callers that
+    only need e.g. ``components["logger"]`` never pay for the rest.
     """
-    overrides = overrides or {}
-    config = ConfigManager(config)#: Dict[str, Any]) -> None
 
-    # 1) Logger    
-    from utils.logger import setup_logger
-    logger = overrides.get("logger") or setup_logger(__name__)
+    _KEYS = ("logger", "strategy", "trader", "websocket_client", "data_provider")
+
+    def __init__(
+        self,
+        config: ConfigManager,
+        overrides: Dict[str, object],
+        logger: Optional[object] = None,
+    ) -> None:
+        self._config = config
+        self._overrides = overrides
+        self._default_logger = logger
+
+    def __getitem__(self, key: str) -> object:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    # 1) Logger
+    @cached_property
+    def logger(self) -> object:
+        logger = (
+            self._overrides.get("logger")
+            or self._default_logger
+            or setup_logger(__name__)
+        )
+        logger.info("✅ Logger initialized.")
+        return logger
 
     # 2) Strategy (TradePlanner) – handle possible 'equity' arg via try/except
-    strategy = overrides.get("strategy")
-    if strategy is None:
-        try:
-            equity = config.get("ACCOUNT", {}).get("equity", 0.0)
-            strategy = TradePlanner(equity=equity)
-        except TypeError:
-            strategy = TradePlanner()
+    @cached_property
+    def strategy(self) -> object:
+        strategy = self._overrides.get("strategy")
+        if strategy is None:
+            try:
+                equity = self._config.get("ACCOUNT", {}).get("equity", 0.0)
+                strategy = TradePlanner(equity=equity)
+            except TypeError:
+                strategy = TradePlanner()
+        self.logger.info("✅ Strategy initialized: %s", strategy.__class__.__name__)
+        return strategy
 
     # 3) Trader – pass only what the ctor accepts
-    trader = overrides.get("trader")
-    if trader is None:
-        api_cfg = config.get("LBANK_API", {})
-        trader = Trader(
-            api_key=api_cfg.get("api_key", ""),
-            secret_key=api_cfg.get("api_secret", ""),
-            base_url=api_cfg.get("base_url", "https://api.lbank.info"),
-            logger=logger,
-        )
+    @cached_property
+    def trader(self) -> object:
+        trader = self._overrides.get("trader")
+        if trader is None:
+            api_cfg = self._config.get("LBANK_API", {})
+            trader = Trader(
+                api_key=api_cfg.get("api_key", ""),
+                secret_key=api_cfg.get("api_secret", ""),
+                base_url=api_cfg.get("base_url", "https://api.lbank.info"),
+                logger=self.logger,
+                signature_method=api_cfg.get("signature_method", "MD5"),
+            )
+        self.logger.info("✅ Trader initialized.")
+        return trader
 
     # 4) Optional data provider
-    data_provider = overrides.get("data_provider")
+    @cached_property
+    def data_provider(self) -> object:
+        return self._overrides.get("data_provider")
+
+    def _ws_arg(self, name: str) -> object:
+        if name == "config":
+            return self._config
+        if name == "message_callback":
+            from core.message_handler import handle_message  # lazy import to avoid cycles
+            return handle_message
+        return getattr(self, name)
 
     # 5) WebSocket client – pass only accepted kwargs
-    websocket_client = overrides.get("websocket_client")
-    if websocket_client is None:
-        from core.message_handler import handle_message  # lazy import to avoid cycles
-        import inspect
-
-        candidate_args = {
-            "config": config,
-            "logger": logger, #setup_logger("WebSocketClient"),
-            "trader": trader,
-            "strategy": strategy,
-            "data_provider": data_provider,
-            "message_callback": handle_message,
-        }
-        sig = inspect.signature(WebSocketClient.__init__)
-        ws_kwargs = {k: v for k, v in candidate_args.items() if k in sig.parameters}
-        websocket_client = WebSocketClient(**ws_kwargs)
-
-    logger.info("✅ Logger initialized.")
-    logger.info("✅ Strategy initialized: %s", strategy.__class__.__name__)
-    logger.info("✅ Trader initialized.")
-    logger.info("✅ WebSocketClient initialized.")
-
-    return {
-        "logger": logger,
-        "strategy": strategy,
-        "trader": trader,
-        "websocket_client": websocket_client,
-        "data_provider": data_provider,
-    }
+    @cached_property
+    def websocket_client(self) -> object:
+        websocket_client = self._overrides.get("websocket_client")
+        if websocket_client is None:
+            # Only resolve the components the constructor accepts; the rest
+            # stay unbuilt.
+            ws_kwargs = {name: self._ws_arg(name) for name in _ws_params()}
+            websocket_client = WebSocketClient(**ws_kwargs)
+        self.logger.info("✅ WebSocketClient initialized.")
+        return websocket_client
+
+
+def initialize_components(
+    config: Dict,
+    overrides: Optional[Dict[str, object]] = None,
+    logger: Optional[object] = None
+    ) -> Mapping[str, object]:
+    """
+    Wire together all runtime components (supports DI via overrides).
+
+    Returns a read-only mapping; each component is constructed on first
+    access, so ``components["websocket_client"]`` works as before while
+    unused components are never built.
+
+    Keys you can override:
+    {"logger", "strategy", "trader", "websocket_client", "data_provider"}
+    """
+    return _LazyComponents(ConfigManager(config), overrides or {}, logger)
@@ -8,6 +8,7 @@ injection of custom processing functions.
 from __future__ import annotations
 
 import logging
+import sys
 from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from utils.logger import setup_logger
@@ -83,6 +84,8 @@ async def handle_message(
     *,
     process_fn: Callable[[Dict[str, Any], str, dict], Awaitable[None]] | None = None,
     signal_check_fn: Optional[Callable[[], None]] = None,
+    payload: Optional[bytes] = None,
+    payload_z: Optional[bytes] = None,
 ) -> None:
     """Process a single incoming WebSocket message.
 
@@ -96,6 +99,10 @@ async def handle_message(
         Optional per‑symbol order book snapshots.
     process_fn, signal_check_fn
         Dependency‑injection hooks for unit‑testing.
+    payload, payload_z
+        The message as JSON bytes and zlib‑compressed, when the client runs
+        with ``WS_BROADCAST_COMPRESSED``; forward these instead of
+        re‑serializing ``data`` per subscriber.
     
     """
     # --------------------------------------------------------------------
@@ -104,15 +111,15 @@ async def handle_message(
     # Early skip non-ticker or error payloads
     subscribe_val = data.get("subscribe", "")
     if not isinstance(subscribe_val, str) or not subscribe_val.startswith("ticker."):
-        logger.debug("⏭️ Non-ticker payload skipped: %s", data)
         return
 
     if not _validate_schema(data):
         logger.debug("⏭️ Invalid / non‑ticker payload skipped.")
         return
 
-    symbol = data["subscribe"].split(".")[-1]
-    logger.debug("📥 Valid ticker (%s): %s", symbol, data)
+    symbol = sys.intern(subscribe_val.rpartition(".")[2])
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("📥 Valid ticker (%s): %s", symbol, data)
 
     # --------------------------------------------------------------------
     # Main processing with fault‑tolerance
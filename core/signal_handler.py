@@ -1,9 +1,12 @@
 from __future__ import annotations
+import time
 from datetime import datetime
 from typing import Any, Callable, Dict
 
 from pydantic import ValidationError
 from models.signal import TradeSignal
+from modules.trade_planner import TradePlanner
+from notifiers.SignalDispatcher import SignalDispatcher
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -16,16 +19,13 @@ async def handle_new_signal(
     trade_planner=None,
 ) -> None:
     """Validate/enrich (SLTP) with Pydantic and dispatch."""
-    from notifiers.SignalDispatcher import SignalDispatcher
-
     needed = {"stop_loss","take_profit_1","take_profit_2","take_profit_3"}
     if not needed.issubset(signal):
         if trade_planner is None:
-            from modules.trade_planner import TradePlanner
             trade_planner = TradePlanner()
         sltp = trade_planner.plan_sl_tp(signal["symbol"], float(signal["price"]))
         signal.update(sltp)
-        signal.setdefault("timestamp", datetime.utcnow().timestamp())
+        signal.setdefault("timestamp", time.time())
 
     try:
         sig_model = TradeSignal(**signal)
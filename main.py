@@ -1,12 +1,11 @@
 import asyncio
 import logging
+import os
+import sys
 
 from core.initialization import initialize_components, load_configuration
 from utils.config_validator import validate_config
 from core.message_handler import handle_message
-from modules.trade_planner import TradePlanner
-from modules.indicator import IndicatorCalculator
-from utils.logger import setup_logger
 
 async def run_bot() -> None:
     # Initialize all components and configuration    
@@ -22,29 +21,70 @@ async def run_bot() -> None:
     ws_client.set_message_callback(handle_message)
 
     # Start the application
-    logger.info(f"✅ Starting Trading Bot...")
+    logger.info("✅ Starting Trading Bot...")
+    # Makes a silent fallback from uvloop/winloop to the default loop visible.
+    loop_cls = type(asyncio.get_running_loop())
+    logger.info("⚙️ Event loop: %s.%s", loop_cls.__module__, loop_cls.__qualname__)
 
 
     backoff = 1
-    while True:                              # keep supervising
-        try:
-            await ws_client.run()            # internal reconnect loop
-            logger.info("WS run() returned cleanly. Exiting supervisor.")
-            break
-        except KeyboardInterrupt:
-            logger.info("🛑 Shutdown requested by user.")
-            break
-        except Exception as e:
-            logger.exception("Fatal WS error in run_bot(): %r", e)
-            await asyncio.sleep(backoff)
-            backoff = min(backoff * 2, 30)   # retry
-    await ws_client.graceful_shutdown()
-    logger.info("👋 Bot stopped cleanly.")
+    try:
+        while True:                              # keep supervising
+            try:
+                await ws_client.run()            # internal reconnect loop
+                logger.info("WS run() returned cleanly. Exiting supervisor.")
+                break
+            except KeyboardInterrupt:
+                logger.info("🛑 Shutdown requested by user.")
+                break
+            except Exception as e:
+                logger.exception("Fatal WS error in run_bot(): %r", e)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)   # retry
+    finally:
+        # Also reached on cancellation (Ctrl+C under asyncio.run).
+        for attempt in range(3):
+            if await ws_client.graceful_shutdown():
+                break
+            await asyncio.sleep(0.1 * (2 ** attempt))
+        logger.info("👋 Bot stopped cleanly.")
+
+def _install_fast_event_loop() -> None:
+    """
+    Switch asyncio to a libuv-based loop when one is installed: uvloop on
+    POSIX, winloop on Windows. Both asyncio.run() and
+    asyncio.new_event_loop() then return that loop. Set DISABLE_UVLOOP=1 in
+    the process environment to keep the stock asyncio loop (e.g. when
+    debugging); config.env is only loaded after the loop exists.
+    """
+    if os.environ.get("DISABLE_UVLOOP", "").lower() in ("1", "true", "yes"):
+        return
+    try:
+        if sys.platform == "win32":
+            import winloop as fast_loop
+        else:
+            import uvloop as fast_loop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(fast_loop.EventLoopPolicy())
+
+
+def _enable_copy_on_write() -> None:
+    """
+    Opt in to pandas copy-on-write on pandas 2.x, so shallow frame copies
+    (e.g. in IndicatorCalculator) stay isolated. It is always on from 3.0.
+    """
+    import pandas as pd
+    if pd.__version__.split(".")[0] == "2":
+        pd.set_option("mode.copy_on_write", True)
+
 
 def main() -> None:
     """
     Sync wrapper for Windows/Python <3.11 compatibility.
     """
+    _install_fast_event_loop()
+    _enable_copy_on_write()
     try:
         asyncio.run(run_bot())
     except RuntimeError as e:
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from datetime import datetime
+import time
 from typing import Literal
 from pydantic import BaseModel, Field, validator
 
@@ -9,7 +9,7 @@ class TradeSignal(BaseModel):
     symbol: str = Field(..., min_length=1)
     direction: Direction
     price: float = Field(..., gt=0)
-    timestamp: float = Field(default_factory=lambda: datetime.utcnow().timestamp())
+    timestamp: float = Field(default_factory=time.time)
     stop_loss: float = Field(..., gt=0)
     take_profit_1: float = Field(..., gt=0)
     take_profit_2: float = Field(..., gt=0)
@@ -0,0 +1,224 @@
+"""
+modules/incremental_indicators.py
+---------------------------------
+Streaming indicator state updated in O(1) per candle, so the live feed can
+expose fresh MACD / Ichimoku / RSI / Bollinger values without recomputing the whole window.
+Full-history columns are still produced by IndicatorCalculator.run_all().
+"""
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class _RollingExtreme:
+    """Sliding-window max (or min) over the last ``window`` samples (monotonic deque)."""
+
+    __slots__ = ("window", "maximum", "_dq")
+
+    def __init__(self, window: int, maximum: bool):
+        self.window = window
+        self.maximum = maximum
+        self._dq: Deque[Tuple[int, float]] = deque()
+
+    def push(self, i: int, x: float) -> "_ExtremeUndo":
+        """Add sample ``i``; returns what undo() needs to take it back out."""
+        dq = self._dq
+        popped: List[Tuple[int, float]] = []
+        if self.maximum:
+            while dq and dq[-1][1] <= x:
+                popped.append(dq.pop())
+        else:
+            while dq and dq[-1][1] >= x:
+                popped.append(dq.pop())
+        dq.append((i, x))
+        expired = None
+        if dq[0][0] <= i - self.window:
+            expired = dq.popleft()
+        return popped, expired
+
+    def undo(self, record: "_ExtremeUndo") -> None:
+        """Revert the push() that returned ``record`` (must be the latest one)."""
+        popped, expired = record
+        dq = self._dq
+        if expired is not None:
+            dq.appendleft(expired)
+        dq.pop()
+        dq.extend(reversed(popped))
+
+    @property
+    def value(self) -> float:
+        return self._dq[0][1] if self._dq else np.nan
+
+
+# Entries removed by one _RollingExtreme.push(): popped from the right, and
+# the expired one from the left (if any).
+_ExtremeUndo = Tuple[List[Tuple[int, float]], Optional[Tuple[int, float]]]
+
+# Scalar fields captured by IncrementalIndicators' checkpoint.
+_SCALAR_STATE = ("n", "close", "ema_fast", "ema_slow", "macd", "macd_signal",
+                 "avg_gain", "avg_loss", "rsi", "_boll_mean", "_boll_m2")
+
+
+class IncrementalIndicators:
+    """
+    MACD (EMA recurrences), Ichimoku tenkan/kijun (rolling extremes), Wilder
+    RSI and Bollinger bands (moving mean/variance).
+
+    EMAs use the ``adjust=False`` recurrence ``ema += alpha * (x - ema)``; they
+    converge to the pandas ``ewm(span=...)`` values after a few spans. Bollinger
+    matches IndicatorCalculator exactly; RSI does for the same history.
+    """
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9,
+                 tenkan: int = 9, kijun: int = 26, rsi_period: int = 14,
+                 boll_period: int = 20, num_std: float = 2):
+        self._a_fast = 2.0 / (fast + 1)
+        self._a_slow = 2.0 / (slow + 1)
+        self._a_signal = 2.0 / (signal + 1)
+        self.tenkan = tenkan
+        self.kijun = kijun
+
+        self.n = 0
+        self.close = np.nan
+        self.ema_fast = np.nan
+        self.ema_slow = np.nan
+        self.macd = np.nan
+        self.macd_signal = np.nan
+
+        self._tenkan_hi = _RollingExtreme(tenkan, maximum=True)
+        self._tenkan_lo = _RollingExtreme(tenkan, maximum=False)
+        self._kijun_hi = _RollingExtreme(kijun, maximum=True)
+        self._kijun_lo = _RollingExtreme(kijun, maximum=False)
+
+        self.rsi_period = rsi_period
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.rsi = np.nan
+
+        # Welford add/remove over the last ``boll_period`` closes.
+        self.boll_period = boll_period
+        self.num_std = num_std
+        self._boll_win: Deque[float] = deque(maxlen=boll_period)
+        self._boll_mean = 0.0
+        self._boll_m2 = 0.0
+
+        # Undo record of the newest candle, so revise() can redo it: the
+        # scalars before it, each extreme's push() record and the close the
+        # Bollinger window evicted (None if it was not full). O(1) to keep.
+        self._checkpoint: Optional[Tuple[tuple, Tuple[_ExtremeUndo, ...], Optional[float]]] = None
+
+    def _extremes(self) -> Tuple[_RollingExtreme, ...]:
+        return (self._tenkan_hi, self._tenkan_lo, self._kijun_hi, self._kijun_lo)
+
+    def _undo_last(self) -> None:
+        """Roll the state back to before the newest candle."""
+        assert self._checkpoint is not None
+        scalars, extremes, evicted = self._checkpoint
+        for name, value in zip(_SCALAR_STATE, scalars):
+            setattr(self, name, value)
+        for ext, record in zip(self._extremes(), extremes):
+            ext.undo(record)
+        self._boll_win.pop()
+        if evicted is not None:
+            self._boll_win.appendleft(evicted)
+        self._checkpoint = None
+
+    def revise(self, high: float, low: float, close: float) -> None:
+        """Replace the newest candle (an in-progress bar that changed)."""
+        if self._checkpoint is not None:
+            self._undo_last()
+        self.update(high, low, close)
+
+    def update(self, high: float, low: float, close: float) -> None:
+        """Fold one new candle into the running state."""
+        scalars = tuple(getattr(self, name) for name in _SCALAR_STATE)
+        win = self._boll_win
+        evicted = win[0] if len(win) == self.boll_period else None
+        i = self.n
+        self.n += 1
+        prev_close = self.close
+        self.close = close
+
+        if i == 0:
+            self.ema_fast = self.ema_slow = close
+            self.macd = 0.0
+            self.macd_signal = 0.0
+        else:
+            self.ema_fast += self._a_fast * (close - self.ema_fast)
+            self.ema_slow += self._a_slow * (close - self.ema_slow)
+            self.macd = self.ema_fast - self.ema_slow
+            self.macd_signal += self._a_signal * (self.macd - self.macd_signal)
+
+        extremes = (
+            self._tenkan_hi.push(i, high),
+            self._tenkan_lo.push(i, low),
+            self._kijun_hi.push(i, high),
+            self._kijun_lo.push(i, low),
+        )
+
+        if i > 0:
+            self._update_rsi(i, close - prev_close)
+        self._update_boll(close)
+        self._checkpoint = (scalars, extremes, evicted)
+
+    def _update_rsi(self, i: int, delta: float) -> None:
+        p = self.rsi_period
+        gain, loss = (delta, 0.0) if delta > 0 else (0.0, -delta)
+        if i <= p:
+            # Seed: simple average of the first ``p`` moves.
+            self.avg_gain += gain
+            self.avg_loss += loss
+            if i < p:
+                return
+            self.avg_gain /= p
+            self.avg_loss /= p
+        else:
+            self.avg_gain = (self.avg_gain * (p - 1) + gain) / p
+            self.avg_loss = (self.avg_loss * (p - 1) + loss) / p
+        self.rsi = 100.0 - 100.0 / (1.0 + self.avg_gain / (self.avg_loss + 1e-10))
+
+    def _update_boll(self, x: float) -> None:
+        win = self._boll_win
+        if len(win) < self.boll_period:
+            win.append(x)
+            delta = x - self._boll_mean
+            self._boll_mean += delta / len(win)
+            self._boll_m2 += delta * (x - self._boll_mean)
+            return
+        y = win[0]
+        win.append(x)  # evicts y
+        old_mean = self._boll_mean
+        self._boll_mean += (x - y) / self.boll_period
+        self._boll_m2 += (x - y) * (x - self._boll_mean + y - old_mean)
+
+    def seed(self, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> None:
+        """Replay a history (oldest first) into a fresh state."""
+        for h, l, c in zip(highs.tolist(), lows.tolist(), closes.tolist()):
+            self.update(h, l, c)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Latest indicator values; NaN until enough candles have been seen."""
+        tenkan = np.nan
+        kijun = np.nan
+        if self.n >= self.tenkan:
+            tenkan = (self._tenkan_hi.value + self._tenkan_lo.value) / 2
+        if self.n >= self.kijun:
+            kijun = (self._kijun_hi.value + self._kijun_lo.value) / 2
+        sma = std = np.nan
+        if len(self._boll_win) == self.boll_period:
+            sma = self._boll_mean
+            std = np.sqrt(max(self._boll_m2, 0.0) / (self.boll_period - 1))
+        return {
+            "close_price": self.close,
+            "macd": self.macd,
+            "macd_signal": self.macd_signal,
+            "macd_hist": self.macd - self.macd_signal,
+            "tenkan_sen": tenkan,
+            "kijun_sen": kijun,
+            "rsi": self.rsi,
+            "boll_sma": sma,
+            "boll_std": std,
+            "boll_upper": sma + self.num_std * std,
+            "boll_lower": sma - self.num_std * std,
+        }
@@ -1,6 +1,39 @@
+from typing import Callable, Dict, Optional
+
 import pandas as pd
 import numpy as np
-from scipy.signal import argrelextrema
+
+from modules.incremental_indicators import IncrementalIndicators
+from modules.indicator_kernels import (
+    FUSED_COLUMNS, NUMBA_AVAILABLE, move_max, move_mean, move_min, move_std,
+    shift, wilder_rsi, compute_all as compute_all_kernel, macd as macd_kernel,
+)
+from modules.ohlcv_buffer import REJECTED, REPLACED, OHLCVRing
+
+# Normalized OHLCV column names, in OHLCVRing column order.
+_PRICE_COLUMNS = ('open_price', 'high_price', 'low_price', 'close_price', 'volume')
+
+FIB_LEVELS = ('fib_0', 'fib_23.6', 'fib_38.2', 'fib_50.0', 'fib_61.8', 'fib_78.6', 'fib_100')
+_FIB_RATIOS = np.array([1.0, 0.236, 0.382, 0.5, 0.618, 0.786, 0.0])
+
+
+def _local_extrema(values: np.ndarray, order: int,
+                   comparator: Callable[[np.ndarray, np.ndarray], np.ndarray]) -> np.ndarray:
+    """
+    Mask of points where ``comparator(x[i], x[i +/- k])`` holds for every
+    k in 1..order, with out-of-range neighbours clipped to the edges; the
+    same result as ``scipy.signal.argrelextrema(..., mode='clip')``.
+    """
+    n = values.shape[0]
+    mask = np.ones(n, dtype=bool)
+    if n == 0:
+        return mask
+    padded = np.pad(values, order, mode='edge')
+    for k in range(1, order + 1):
+        mask &= comparator(values, padded[order - k:order - k + n])
+        mask &= comparator(values, padded[order + k:order + k + n])
+    return mask
+
 
 class IndicatorCalculator:
     def _normalize_columns(self):
@@ -11,161 +44,266 @@ class IndicatorCalculator:
         "close": "close_price",
         "volume": "volume"
         }
-        self.df.rename(columns=rename_map, inplace=True)
+        # Relabels this frame only; column data is not copied.
+        self.df.columns = [rename_map.get(c, c) for c in self.df.columns]
 
-    def __init__(self, df=None):
-        self.df = df.copy() if df is not None else pd.DataFrame()
+    def __init__(self, df: Optional[pd.DataFrame] = None, capacity: int = 200) -> None:
+        # Shallow copy: shares the caller's column arrays. Indicator methods
+        # only add or replace whole columns, so the caller's frame is never
+        # modified.
+        self.df = df.copy(deep=False) if df is not None else pd.DataFrame()
         self._normalize_columns()
+        self.ring = OHLCVRing(capacity)
+        self.ring.load(self.df)
+        # Streaming state, seeded from the ring on the first update() or
+        # snapshot(); one-shot run_all() callers never pay for it.
+        self._incremental: Optional[IncrementalIndicators] = None
+        self._stale = False  # True when the ring holds candles not yet in self.df
+        self._computed_version: Optional[int] = None  # ring.version the indicator columns reflect
+        self.fib_levels: Dict[str, float] = {}  # latest Fibonacci levels, filled by calculate_fibonacci()
 
-    def update(self, new_row: dict):
-        self.df = pd.concat([self.df, pd.DataFrame([new_row])], ignore_index=True)
-        self._normalize_columns()
-        if len(self.df) > 200:
-            self.df = self.df.iloc[-200:]
+    @classmethod
+    def from_array(cls, values: np.ndarray, timestamps: Optional[np.ndarray] = None,
+                   capacity: int = 200) -> "IndicatorCalculator":
+        """
+        Build from an (N, 5) OHLCV ndarray (open, high, low, close, volume)
+        straight into the ring buffer; the DataFrame is only materialized
+        when run_all()/get_df() is called.
+        """
+        calc = cls(capacity=capacity)
+        calc.ring.load_array(np.asarray(values, dtype=np.float64), timestamps)
+        calc._stale = bool(calc.ring.count)
+        return calc
 
-        return self.run_all(latest_only=True)
+    @property
+    def incremental(self) -> IncrementalIndicators:
+        """Streaming indicator state, replayed from the ring on first use."""
+        if self._incremental is None:
+            idx = self.ring.order()
+            vals = self.ring.values
+            self._incremental = IncrementalIndicators()
+            self._incremental.seed(vals[idx, 1], vals[idx, 2], vals[idx, 3])
+        return self._incremental
+
+    def update(self, new_row: dict) -> "IndicatorCalculator":
+        """
+        O(1) per candle: store the row and advance the streaming indicators
+        (or revise them, when the row updates the in-progress candle).
+        The full indicator frame is rebuilt lazily by run_all()/get_df().
+        """
+        incremental = self.incremental  # seed from the candles before this one
+        status = self.ring.push_row(new_row)
+        if status == REJECTED:
+            return self  # out-of-order candle
+        row = self.ring.values[self.ring.head - 1]
+        if status == REPLACED:
+            incremental.revise(row[1], row[2], row[3])
+        else:
+            incremental.update(row[1], row[2], row[3])
+        self._stale = True
+        return self
+
+    def adopt(self, df: pd.DataFrame, version: int) -> bool:
+        """
+        Install an indicator frame computed elsewhere (e.g. in a worker
+        thread) from ring ``version``. Ignored if newer candles arrived since.
+        """
+        if version != self.ring.version:
+            return False
+        self.df = df
+        self._stale = False
+        self._computed_version = version
+        return True
+
+    def snapshot(self) -> Dict[str, float]:
+        """Latest streaming indicator values (see IncrementalIndicators)."""
+        return self.incremental.snapshot()
 
     def run_all(self, latest_only=False):
-        return (
-            self.calculate_ichimoku(latest_only)
+        if self._stale:
+            self.df = self.ring.as_frame(_PRICE_COLUMNS)
+            self._stale = False
+        elif self._computed_version == self.ring.version:
+            return self  # no new candle since the last full run
+        self._computed_version = self.ring.version
+        if NUMBA_AVAILABLE:
+            # Keltner, Bollinger, RSI and MACD in one compiled pass.
+            self.calculate_ichimoku(latest_only).compute_all()
+        else:
+            (self.calculate_ichimoku(latest_only)
                 .calculate_keltner(latest_only)
-                .find_swing_points(latest_only)
-                .calculate_fibonacci()
                 .calculate_bollinger(latest_only)
                 .calculate_rsi(latest_only)
-                .calculate_macd(latest_only)
+                .calculate_macd(latest_only))
+        return (
+            self.find_swing_points(latest_only)
+                .calculate_fibonacci()
                 .detect_candlestick_patterns(latest_only)
         )
 
+    def compute_all(self, ema_period: int = 20, atr_period: int = 10, multiplier: float = 2,
+                    boll_period: int = 20, num_std: float = 2, rsi_period: int = 14,
+                    fast: int = 12, slow: int = 26, signal: int = 9) -> "IndicatorCalculator":
+        """Fused equivalent of calculate_keltner/bollinger/rsi/macd."""
+        out = compute_all_kernel(
+            self.df['high_price'].to_numpy(dtype=np.float64),
+            self.df['low_price'].to_numpy(dtype=np.float64),
+            self.df['close_price'].to_numpy(dtype=np.float64),
+            ema_period, atr_period, boll_period, rsi_period, fast, slow, signal,
+        )
+        ema, atr, sma, std = out[:, 0], out[:, 2], out[:, 3], out[:, 4]
+        self.df[list(FUSED_COLUMNS)] = out
+        self.df[['keltner_upper', 'keltner_lower', 'boll_upper', 'boll_lower']] = np.column_stack(
+            (ema + multiplier * atr, ema - multiplier * atr, sma + num_std * std, sma - num_std * std)
+        )
+        return self
+
     def calculate_ichimoku(self, latest_only=False, tenkan=9, kijun=26, senkou=52):
-        high = self.df['high_price']
-        low = self.df['low_price']
-        close = self.df['close_price']
-
-        last = None if not latest_only else -1
-        self.df.loc[:, 'tenkan_sen'] = (high.rolling(tenkan).max() + low.rolling(tenkan).min()) / 2
-        self.df.loc[:, 'kijun_sen'] = (high.rolling(kijun).max() + low.rolling(kijun).min()) / 2
-        self.df.loc[:, 'senkou_span_a'] = ((self.df['tenkan_sen'] + self.df['kijun_sen']) / 2).shift(kijun)
-        self.df.loc[:, 'senkou_span_b'] = ((high.rolling(senkou).max() + low.rolling(senkou).min()) / 2).shift(kijun)
-        self.df.loc[:, 'chikou_span'] = close.shift(-kijun)
+        high = self.df['high_price'].to_numpy(dtype=np.float64)
+        low = self.df['low_price'].to_numpy(dtype=np.float64)
+        close = self.df['close_price'].to_numpy(dtype=np.float64)
+
+        tenkan_sen = (move_max(high, tenkan) + move_min(low, tenkan)) / 2
+        kijun_sen = (move_max(high, kijun) + move_min(low, kijun)) / 2
+        senkou_b = (move_max(high, senkou) + move_min(low, senkou)) / 2
+        self.df['tenkan_sen'] = tenkan_sen
+        self.df['kijun_sen'] = kijun_sen
+        self.df['senkou_span_a'] = shift((tenkan_sen + kijun_sen) / 2, kijun)
+        self.df['senkou_span_b'] = shift(senkou_b, kijun)
+        self.df['chikou_span'] = shift(close, -kijun)
         return self
 
     def calculate_keltner(self, latest_only=False, ema_period=20, atr_period=10, multiplier=2):
         df = self.df
         df['ema'] = df['close_price'].ewm(span=ema_period, adjust=False).mean()
-        df['tr'] = np.maximum(df['high_price'] - df['low_price'],
-                              np.maximum(abs(df['high_price'] - df['close_price'].shift()),
-                                         abs(df['low_price'] - df['close_price'].shift())))
-        df['atr'] = df['tr'].rolling(atr_period).mean()
+        h = df['high_price'].to_numpy(dtype=np.float64)
+        l = df['low_price'].to_numpy(dtype=np.float64)
+        cp = df['close_price'].shift().to_numpy(dtype=np.float64)
+        df['tr'] = np.maximum.reduce([h - l, np.abs(h - cp), np.abs(l - cp)])
+        df['atr'] = move_mean(df['tr'].to_numpy(), atr_period)
         df['keltner_upper'] = df['ema'] + multiplier * df['atr']
         df['keltner_lower'] = df['ema'] - multiplier * df['atr']
         return self
 
     def find_swing_points(self, latest_only=False, order=3):
-        high = self.df['high_price']
-        low = self.df['low_price']
+        high = self.df['high_price'].to_numpy(dtype=np.float64)
+        low = self.df['low_price'].to_numpy(dtype=np.float64)
 
-        self.df['swing_high'] = np.nan
-        self.df['swing_low'] = np.nan
+        high_mask = _local_extrema(high, order, np.greater_equal)
+        low_mask = _local_extrema(low, order, np.less_equal)
 
-        high_idx = argrelextrema(high.values, np.greater_equal, order=order)[0]
-        low_idx = argrelextrema(low.values, np.less_equal, order=order)[0]
-
-        self.df.loc[high_idx, 'swing_high'] = high.iloc[high_idx]
-        self.df.loc[low_idx, 'swing_low'] = low.iloc[low_idx]
+        # Positional scatter on plain arrays, then one assignment per column.
+        self.df['swing_high'] = np.where(high_mask, high, np.nan)
+        self.df['swing_low'] = np.where(low_mask, low, np.nan)
         return self
 
     def calculate_fibonacci(self):
-        swing_highs = self.df['swing_high'].dropna()
-        swing_lows = self.df['swing_low'].dropna()
+        swing_highs = self.df['swing_high'].to_numpy(dtype=np.float64)
+        swing_lows = self.df['swing_low'].to_numpy(dtype=np.float64)
+        high_idx = np.flatnonzero(~np.isnan(swing_highs))
+        low_idx = np.flatnonzero(~np.isnan(swing_lows))
 
-        if swing_highs.empty or swing_lows.empty:
-            for level in ['fib_0', 'fib_23.6', 'fib_38.2', 'fib_50.0', 'fib_61.8', 'fib_78.6', 'fib_100']:
-                self.df[level] = np.nan
+        if not high_idx.size or not low_idx.size:
+            self.fib_levels = dict.fromkeys(FIB_LEVELS, np.nan)
+            self.df[list(FIB_LEVELS)] = np.nan
             return self
 
-        last_high = swing_highs.iloc[-1]
-        last_low = swing_lows.iloc[-1]
-        diff = last_high - last_low
-
-        levels = {
-            'fib_0': last_low,
-            'fib_23.6': last_high - 0.236 * diff,
-            'fib_38.2': last_high - 0.382 * diff,
-            'fib_50.0': last_high - 0.500 * diff,
-            'fib_61.8': last_high - 0.618 * diff,
-            'fib_78.6': last_high - 0.786 * diff,
-            'fib_100': last_high
-        }
+        last_high = swing_highs[high_idx[-1]]
+        last_low = swing_lows[low_idx[-1]]
+        # fib_0 is the swing low, fib_100 the swing high, the rest retrace from the high.
+        vals = last_high - _FIB_RATIOS * (last_high - last_low)
+        vals[0] = last_low
+        vals[-1] = last_high
 
-        for key, val in levels.items():
-            self.df[key] = val
+        self.fib_levels = dict(zip(FIB_LEVELS, vals.tolist()))
+        self.df[list(FIB_LEVELS)] = np.broadcast_to(vals, (len(self.df), len(FIB_LEVELS)))
         return self
 
     def calculate_bollinger(self, latest_only=False, period=20, num_std=2):
-        close = self.df['close_price']
-        self.df['boll_sma'] = close.rolling(window=period).mean()
-        self.df['boll_std'] = close.rolling(window=period).std()
-        self.df['boll_upper'] = self.df['boll_sma'] + num_std * self.df['boll_std']
-        self.df['boll_lower'] = self.df['boll_sma'] - num_std * self.df['boll_std']
+        close = self.df['close_price'].to_numpy(dtype=np.float64)
+        sma = move_mean(close, period)
+        std = move_std(close, period)
+        self.df[['boll_sma', 'boll_std', 'boll_upper', 'boll_lower']] = np.column_stack(
+            (sma, std, sma + num_std * std, sma - num_std * std)
+        )
         return self
 
     def calculate_rsi(self, latest_only=False, period=14):
-        delta = self.df['close_price'].diff()
-        gain = delta.clip(lower=0)
-        loss = -delta.clip(upper=0)
-        avg_gain = gain.rolling(window=period).mean()
-        avg_loss = loss.rolling(window=period).mean()
-        rs = avg_gain / (avg_loss + 1e-10)
-        self.df['rsi'] = 100 - (100 / (1 + rs))
+        close = self.df['close_price'].to_numpy(dtype=np.float64)
+        if NUMBA_AVAILABLE or len(close) <= period:
+            self.df['rsi'] = wilder_rsi(close, period)
+            return self
+
+        # Without numba the kernel is an interpreted loop; use vectorized ops
+        # plus pandas' compiled ewm for the Wilder recursion instead.
+        delta = np.diff(close, prepend=np.nan)
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = np.where(delta > 0, 0.0, -delta)
+        # Seed with the SMA of the first `period` moves, then smooth with alpha=1/period.
+        gain[period] = gain[1:period + 1].mean()
+        loss[period] = loss[1:period + 1].mean()
+        avg = pd.DataFrame({'gain': gain[period:], 'loss': loss[period:]}).ewm(
+            alpha=1.0 / period, adjust=False).mean().to_numpy()
+        rsi = np.full(len(close), np.nan)
+        rsi[period:] = 100.0 - 100.0 / (1.0 + avg[:, 0] / (avg[:, 1] + 1e-10))
+        self.df['rsi'] = rsi
         return self
 
     def calculate_macd(self, latest_only=False, fast=12, slow=26, signal=9):
-        ema_fast = self.df['close_price'].ewm(span=fast).mean()
-        ema_slow = self.df['close_price'].ewm(span=slow).mean()
-        self.df['macd'] = ema_fast - ema_slow
-        self.df['macd_signal'] = self.df['macd'].ewm(span=signal).mean()
-        self.df['macd_hist'] = self.df['macd'] - self.df['macd_signal']
+        close = self.df['close_price'].to_numpy(dtype=np.float64)
+        self.df[['macd', 'macd_signal', 'macd_hist']] = macd_kernel(close, fast, slow, signal)
         return self
 
     def detect_candlestick_patterns(self, latest_only=False):
         df = self.df
-        df['bullish_candle'] = df['close_price'] > df['open_price']
-        df['bearish_candle'] = df['close_price'] < df['open_price']
-        df['body'] = abs(df['close_price'] - df['open_price'])
-        df['range'] = df['high_price'] - df['low_price']
-        df['upper_shadow'] = df['high_price'] - df[['close_price', 'open_price']].max(axis=1)
-        df['lower_shadow'] = df[['close_price', 'open_price']].min(axis=1) - df['low_price']
-        df['doji'] = df['body'] <= (df['range'] * 0.1)
-        df['hammer'] = (df['lower_shadow'] > 2 * df['body']) & (df['upper_shadow'] < df['body']) & df['bullish_candle']
-        df['inv_hammer'] = (df['upper_shadow'] > 2 * df['body']) & (df['lower_shadow'] < df['body']) & df['bullish_candle']
-        df['bullish_engulfing'] = (
-            df['bullish_candle'] &
-            (df['open_price'] < df['close_price'].shift(1)) &
-            (df['close_price'] > df['open_price'].shift(1)) &
-            df['bearish_candle'].shift(1)
-        )
-        df['bearish_engulfing'] = (
-            df['bearish_candle'] &
-            (df['open_price'] > df['close_price'].shift(1)) &
-            (df['close_price'] < df['open_price'].shift(1)) &
-            df['bullish_candle'].shift(1)
+        open_ = df['open_price'].to_numpy(dtype=np.float64)
+        close = df['close_price'].to_numpy(dtype=np.float64)
+        high = df['high_price'].to_numpy(dtype=np.float64)
+        low = df['low_price'].to_numpy(dtype=np.float64)
+        # Previous-bar values, shifted once and reused by both engulfing masks.
+        prev_open = shift(open_, 1)
+        prev_close = shift(close, 1)
+
+        bull = close > open_
+        bear = close < open_
+        prev_bull = np.zeros_like(bull)
+        prev_bull[1:] = bull[:-1]
+        prev_bear = np.zeros_like(bear)
+        prev_bear[1:] = bear[:-1]
+
+        body = np.abs(close - open_)
+        rng = high - low
+        upper_shadow = high - np.fmax(close, open_)
+        lower_shadow = np.fmin(close, open_) - low
+        doji = body <= rng * 0.1
+        hammer = (lower_shadow > 2 * body) & (upper_shadow < body) & bull
+        inv_hammer = (upper_shadow > 2 * body) & (lower_shadow < body) & bull
+        bullish_engulfing = bull & (open_ < prev_close) & (close > prev_open) & prev_bear
+        bearish_engulfing = bear & (open_ > prev_close) & (close < prev_open) & prev_bull
+        bull_score = hammer.astype(np.int64) + inv_hammer + bullish_engulfing
+        bear_score = bearish_engulfing.astype(np.int64)
+
+        df['bullish_candle'] = bull
+        df['bearish_candle'] = bear
+        df['body'] = body
+        df['range'] = rng
+        df['upper_shadow'] = upper_shadow
+        df['lower_shadow'] = lower_shadow
+        df['doji'] = doji
+        df['hammer'] = hammer
+        df['inv_hammer'] = inv_hammer
+        df['bullish_engulfing'] = bullish_engulfing
+        df['bearish_engulfing'] = bearish_engulfing
+        df['bullish_score'] = bull_score
+        df['bearish_score'] = bear_score
+        df['patterns_result'] = pd.Categorical(
+            np.select([doji, bull_score > bear_score, bear_score > bull_score],
+                      ["Neutral", "Bullish", "Bearish"], default="Neutral"),
+            categories=["Neutral", "Bullish", "Bearish"],
         )
-        df['bullish_score'] = df[['hammer', 'inv_hammer', 'bullish_engulfing']].sum(axis=1)
-        df['bearish_score'] = df[['bearish_engulfing']].sum(axis=1)
-
-        def classify(row):
-            if row['doji']:
-                return "Neutral"
-            if row['bullish_score'] > row['bearish_score']:
-                return "Bullish"
-            elif row['bearish_score'] > row['bullish_score']:
-                return "Bearish"
-            else:
-                return "Neutral"
-
-        df['patterns_result'] = df.apply(classify, axis=1)
         return self
 
     def get_df(self):
+        if self._stale:
+            self.run_all()
         return self.df
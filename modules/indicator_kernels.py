@@ -0,0 +1,312 @@
+"""
+modules/indicator_kernels.py
+----------------------------
+Numeric kernels used by IndicatorCalculator, operating on raw float64
+arrays instead of pandas objects.
+
+* Moving-window reductions use bottleneck (optional) and fall back to
+  NumPy sliding windows; results match ``Series.rolling(window)`` with the
+  default ``min_periods=window`` (all NaN for inputs shorter than the
+  window, which bottleneck itself rejects).
+* Loop-based kernels for recursive indicators are compiled with numba
+  (optional); otherwise the same functions run as plain Python.
+"""
+from typing import Any, Callable
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    import bottleneck as bn
+except ImportError:  # optional speed-up
+    bn = None
+
+
+def _njit_fallback(*args: Any, **kwargs: Any) -> Any:
+    """No-op stand-in for ``numba.njit`` (bare or with options)."""
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda fn: fn
+
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # optional speed-up
+    NUMBA_AVAILABLE = False
+    njit = _njit_fallback
+
+
+# ---------------------------------------------------------------------------
+# Moving-window reductions
+# ---------------------------------------------------------------------------
+
+def _rolling(arr: np.ndarray, window: int, reduce: Callable[..., Any]) -> np.ndarray:
+    out = np.full(arr.shape[0], np.nan)
+    if arr.shape[0] >= window:
+        out[window - 1:] = reduce(sliding_window_view(arr, window), axis=1)
+    return out
+
+
+def move_max(arr: np.ndarray, window: int) -> np.ndarray:
+    if bn is not None and arr.shape[0] >= window:
+        out: np.ndarray = bn.move_max(arr, window=window, min_count=window)
+        return out
+    return _rolling(arr, window, np.max)
+
+
+def move_min(arr: np.ndarray, window: int) -> np.ndarray:
+    if bn is not None and arr.shape[0] >= window:
+        out: np.ndarray = bn.move_min(arr, window=window, min_count=window)
+        return out
+    return _rolling(arr, window, np.min)
+
+
+def move_mean(arr: np.ndarray, window: int) -> np.ndarray:
+    if bn is not None and arr.shape[0] >= window:
+        out: np.ndarray = bn.move_mean(arr, window=window, min_count=window)
+        return out
+    return _rolling(arr, window, np.mean)
+
+
+def move_std(arr: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """Moving standard deviation; ``ddof=1`` matches ``rolling().std()``."""
+    if bn is not None and arr.shape[0] >= window:
+        out: np.ndarray = bn.move_std(arr, window=window, min_count=window, ddof=ddof)
+        return out
+    return _rolling(arr, window, lambda w, axis: np.std(w, axis=axis, ddof=ddof))
+
+
+def shift(arr: np.ndarray, periods: int) -> np.ndarray:
+    """NumPy equivalent of ``Series.shift(periods)`` for float arrays."""
+    out = np.full(arr.shape[0], np.nan)
+    if periods > 0:
+        out[periods:] = arr[:-periods]
+    elif periods < 0:
+        out[:periods] = arr[-periods:]
+    else:
+        out[:] = arr
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Recursive kernels
+# ---------------------------------------------------------------------------
+
+
+@njit(cache=True)
+def wilder_rsi(close: np.ndarray, period: int) -> np.ndarray:
+    """
+    RSI with Wilder smoothing: the first average is the SMA of ``period``
+    gains/losses, then ``avg = (avg * (period - 1) + x) / period``.
+    The first ``period`` outputs are NaN.
+    """
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    if n <= period:
+        return out
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        d = close[i] - close[i - 1]
+        if d > 0:
+            avg_gain += d
+        else:
+            avg_loss -= d
+    avg_gain /= period
+    avg_loss /= period
+    out[period] = 100.0 - 100.0 / (1.0 + avg_gain / (avg_loss + 1e-10))
+
+    for i in range(period + 1, n):
+        d = close[i] - close[i - 1]
+        gain = d if d > 0 else 0.0
+        loss = -d if d < 0 else 0.0
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+        out[i] = 100.0 - 100.0 / (1.0 + avg_gain / (avg_loss + 1e-10))
+    return out
+
+
+@njit(cache=True)
+def macd(close: np.ndarray, fast: int, slow: int, signal: int) -> np.ndarray:
+    """
+    MACD line, signal and histogram as an (N, 3) array in one pass.
+
+    Each EMA uses the ``adjust=True`` form of ``Series.ewm(span=...)``,
+    kept as running numerator/denominator sums, so the output matches the
+    pandas implementation it replaces.
+    """
+    n = close.shape[0]
+    out = np.full((n, 3), np.nan)
+    w_fast = 1.0 - 2.0 / (fast + 1)
+    w_slow = 1.0 - 2.0 / (slow + 1)
+    w_sig = 1.0 - 2.0 / (signal + 1)
+    num_fast = den_fast = 0.0
+    num_slow = den_slow = 0.0
+    num_sig = den_sig = 0.0
+
+    for i in range(n):
+        x = close[i]
+        num_fast *= w_fast
+        den_fast *= w_fast
+        num_slow *= w_slow
+        den_slow *= w_slow
+        if not np.isnan(x):
+            num_fast += x
+            den_fast += 1.0
+            num_slow += x
+            den_slow += 1.0
+        if den_fast == 0.0:
+            continue
+        line = num_fast / den_fast - num_slow / den_slow
+        num_sig = num_sig * w_sig + line
+        den_sig = den_sig * w_sig + 1.0
+        sig = num_sig / den_sig
+        out[i, 0] = line
+        out[i, 1] = sig
+        out[i, 2] = line - sig
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Fused single-pass kernel
+# ---------------------------------------------------------------------------
+
+# Column order of the array returned by compute_all().
+FUSED_COLUMNS = ('ema', 'tr', 'atr', 'boll_sma', 'boll_std',
+                 'rsi', 'macd', 'macd_signal', 'macd_hist')
+
+
+@njit(cache=True)
+def _window_push(buf: np.ndarray, state: np.ndarray, i: int, x: float) -> None:
+    """
+    Add sample ``i`` to a moving window of ``len(buf)`` values, keeping
+    ``state = [count, mean, m2]`` with Welford's add/remove update.
+    A NaN resets the window, so it only becomes full after ``len(buf)``
+    consecutive finite samples (the ``min_periods=window`` rule).
+    """
+    w = buf.shape[0]
+    if np.isnan(x):
+        state[0] = 0.0
+        state[1] = 0.0
+        state[2] = 0.0
+        return
+    slot = i % w
+    if state[0] < w:
+        state[0] += 1.0
+        delta = x - state[1]
+        state[1] += delta / state[0]
+        state[2] += delta * (x - state[1])
+    else:
+        y = buf[slot]
+        old_mean = state[1]
+        state[1] += (x - y) / w
+        state[2] += (x - y) * (x - state[1] + y - old_mean)
+    buf[slot] = x
+
+
+@njit(cache=True)
+def compute_all(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                ema_period: int, atr_period: int, boll_period: int,
+                rsi_period: int, fast: int, slow: int, signal: int) -> np.ndarray:
+    """
+    Keltner EMA/TR/ATR, Bollinger mean/std, Wilder RSI and MACD in one
+    pass over the bars; returns an (N, len(FUSED_COLUMNS)) array with the
+    same values as the per-indicator code paths.
+    """
+    n = close.shape[0]
+    out = np.full((n, 9), np.nan)
+
+    a_ema = 2.0 / (ema_period + 1)
+    ema = np.nan
+
+    atr_buf = np.empty(atr_period)
+    atr_state = np.zeros(3)
+    boll_buf = np.empty(boll_period)
+    boll_state = np.zeros(3)
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+
+    w_fast = 1.0 - 2.0 / (fast + 1)
+    w_slow = 1.0 - 2.0 / (slow + 1)
+    w_sig = 1.0 - 2.0 / (signal + 1)
+    num_fast = den_fast = 0.0
+    num_slow = den_slow = 0.0
+    num_sig = den_sig = 0.0
+
+    for i in range(n):
+        x = close[i]
+
+        # Keltner: EMA (adjust=False), true range and its moving mean.
+        if not np.isnan(x):
+            ema = x if np.isnan(ema) else (1.0 - a_ema) * ema + a_ema * x
+        out[i, 0] = ema
+        tr = np.nan
+        if i > 0:
+            pc = close[i - 1]
+            tr = max(high[i] - low[i], abs(high[i] - pc), abs(low[i] - pc))
+            if np.isnan(high[i]) or np.isnan(low[i]) or np.isnan(pc):
+                tr = np.nan
+        out[i, 1] = tr
+        _window_push(atr_buf, atr_state, i, tr)
+        if atr_state[0] == atr_period:
+            out[i, 2] = atr_state[1]
+
+        # Bollinger: moving mean and sample std (ddof=1).
+        _window_push(boll_buf, boll_state, i, x)
+        if boll_state[0] == boll_period:
+            out[i, 3] = boll_state[1]
+            out[i, 4] = np.sqrt(max(boll_state[2], 0.0) / (boll_period - 1))
+
+        # RSI with Wilder smoothing (see wilder_rsi).
+        if i > 0:
+            d = x - close[i - 1]
+            if d > 0:
+                gain = d
+                loss = 0.0
+            else:
+                gain = 0.0
+                loss = -d
+            if i <= rsi_period:
+                avg_gain += gain
+                avg_loss += loss
+                if i == rsi_period:
+                    avg_gain /= rsi_period
+                    avg_loss /= rsi_period
+            else:
+                avg_gain = (avg_gain * (rsi_period - 1) + gain) / rsi_period
+                avg_loss = (avg_loss * (rsi_period - 1) + loss) / rsi_period
+            if i >= rsi_period:
+                out[i, 5] = 100.0 - 100.0 / (1.0 + avg_gain / (avg_loss + 1e-10))
+
+        # MACD with adjust=True EMAs (see macd).
+        num_fast *= w_fast
+        den_fast *= w_fast
+        num_slow *= w_slow
+        den_slow *= w_slow
+        if not np.isnan(x):
+            num_fast += x
+            den_fast += 1.0
+            num_slow += x
+            den_slow += 1.0
+        if den_fast > 0.0:
+            line = num_fast / den_fast - num_slow / den_slow
+            num_sig = num_sig * w_sig + line
+            den_sig = den_sig * w_sig + 1.0
+            out[i, 6] = line
+            out[i, 7] = num_sig / den_sig
+            out[i, 8] = line - out[i, 7]
+    return out
+
+
+def warmup() -> None:
+    """
+    Compile the njit kernels on a tiny float64 input, so the first live
+    refresh does not pay the JIT cost (a no-op cost without numba).
+    """
+    dummy = np.linspace(1.0, 2.0, 64)
+    wilder_rsi(dummy, 14)
+    macd(dummy, 12, 26, 9)
+    compute_all(dummy, dummy, dummy, 20, 10, 20, 14, 12, 26, 9)
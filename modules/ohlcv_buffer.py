@@ -0,0 +1,177 @@
+"""
+modules/ohlcv_buffer.py
+-----------------------
+Fixed-capacity OHLCV ring buffer. Candles are written into pre-allocated
+NumPy arrays, so appending a bar never reallocates or re-infers dtypes;
+a DataFrame is only built when a caller asks for one.
+"""
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+# push_row() results.
+REJECTED, APPENDED, REPLACED = 0, 1, 2
+
+# Accept both raw kline names and IndicatorCalculator's normalized names.
+_FIELD_ALIASES = {
+    "open": ("open", "open_price"),
+    "high": ("high", "high_price"),
+    "low": ("low", "low_price"),
+    "close": ("close", "close_price"),
+    "volume": ("volume",),
+}
+
+
+def _lookup(source: Any, field: str) -> Optional[Any]:
+    for name in _FIELD_ALIASES[field]:
+        if name in source:
+            return source[name]
+    return None
+
+
+class OHLCVRing:
+    """Circular buffer of the most recent ``capacity`` candles."""
+
+    def __init__(self, capacity: int = 200):
+        self.capacity = capacity
+        # Column-major (SoA): each OHLCV column is one contiguous strip.
+        self.values = np.empty((capacity, len(OHLCV_COLUMNS)), dtype=np.float64, order="F")
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.head = 0   # next slot to write
+        self.count = 0  # number of valid rows
+        self.version = 0  # bumped on every write; lets readers cache derived data
+        # (version, columns, frame) of the last as_frame()
+        self._frame_cache: Optional[Tuple[int, Tuple[str, ...], pd.DataFrame]] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def push(self, ts: int, open_: float, high: float, low: float,
+             close: float, volume: float) -> None:
+        """Append one candle, overwriting the oldest once full."""
+        i = self.head
+        self.timestamps[i] = ts
+        self.values[i] = (open_, high, low, close, volume)
+        self.head = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        self.version += 1
+
+    def replace_last(self, ts: int, open_: float, high: float, low: float,
+                     close: float, volume: float) -> None:
+        """Overwrite the newest candle in place (an in-progress bar update)."""
+        i = (self.head - 1) % self.capacity
+        self.timestamps[i] = ts
+        self.values[i] = (open_, high, low, close, volume)
+        self.version += 1
+
+    @property
+    def last_ts(self) -> int:
+        """Epoch timestamp of the newest candle (0 when empty)."""
+        if not self.count:
+            return 0
+        return int(self.timestamps[self.head - 1])
+
+    def push_row(self, row: Dict[str, Any]) -> int:
+        """
+        Store a candle given as a dict (kline or normalized column names).
+
+        A candle with the newest timestamp replaces that bar in place (the
+        exchange re-sends the in-progress bar on every trade); a newer one is
+        appended. Returns REPLACED / APPENDED, or REJECTED (falsy), without
+        writing, for a candle older than the newest one stored.
+        """
+        ts = int(row.get("timestamp") or 0)
+        last = self.last_ts
+        if ts and ts < last:
+            return REJECTED
+        vals = tuple(float("nan") if v is None else float(v)
+                     for v in (_lookup(row, f) for f in OHLCV_COLUMNS))
+        if ts and ts == last:
+            self.replace_last(ts, *vals)
+            return REPLACED
+        self.push(ts, *vals)
+        return APPENDED
+
+    def load(self, df: Optional[pd.DataFrame]) -> None:
+        """Replace the contents with the last ``capacity`` rows of ``df``."""
+        self.head = 0
+        self.count = 0
+        self.version += 1
+        if df is None or df.empty:
+            return
+        tail = df.iloc[-self.capacity:]
+        n = len(tail)
+        for j, field in enumerate(OHLCV_COLUMNS):
+            col = _lookup(tail, field)
+            self.values[:n, j] = np.nan if col is None else col.to_numpy(dtype=np.float64)
+        if "timestamp" in tail:
+            self.timestamps[:n] = tail["timestamp"].to_numpy(dtype=np.int64)
+        else:
+            self.timestamps[:n] = 0
+        self.count = n
+        self.head = n % self.capacity
+        self.version += 1
+
+    def load_array(self, values: np.ndarray, timestamps: Optional[np.ndarray] = None) -> None:
+        """
+        Replace the contents with the last ``capacity`` rows of an (N, 5)
+        OHLCV array (column order as OHLCV_COLUMNS), without a DataFrame.
+        """
+        tail = values[-self.capacity:]
+        n = len(tail)
+        self.values[:n] = tail
+        if timestamps is None:
+            self.timestamps[:n] = 0
+        else:
+            self.timestamps[:n] = timestamps[-self.capacity:]
+        self.count = n
+        self.head = n % self.capacity
+        self.version += 1
+
+    def order(self) -> np.ndarray:
+        """Slot indices from oldest to newest."""
+        start = (self.head - self.count) % self.capacity
+        return (start + np.arange(self.count)) % self.capacity
+
+    def ordered(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Chronologically ordered copies of (values, timestamps).
+
+        Uses at most two contiguous slices instead of a fancy-index gather,
+        so no index array is built and each element is copied once.
+        """
+        start = (self.head - self.count) % self.capacity
+        end = start + self.count
+        if end <= self.capacity:
+            return self.values[start:end].copy(order="F"), self.timestamps[start:end].copy()
+        wrap = end - self.capacity
+        values = np.empty((self.count, len(OHLCV_COLUMNS)), dtype=np.float64, order="F")
+        split = self.capacity - start
+        values[:split] = self.values[start:]
+        values[split:] = self.values[:wrap]
+        return values, np.concatenate((self.timestamps[start:], self.timestamps[:wrap]))
+
+    def as_frame(self, columns: Tuple[str, ...] = OHLCV_COLUMNS) -> pd.DataFrame:
+        """
+        Chronologically ordered copy as a DataFrame, built in one
+        constructor call. ``columns`` relabels the five OHLCV columns
+        (default: kline names).
+
+        The frame is cached until the next write; repeated calls at one
+        version (e.g. the compute worker, then a lazy get_df()) get shallow
+        copies of it, which copy-on-write keeps independent.
+        """
+        cached = self._frame_cache
+        if cached is not None and cached[0] == self.version and cached[1] == columns:
+            return cached[2].copy(deep=False)
+        values, timestamps = self.ordered()
+        data = {"timestamp": timestamps}
+        data.update(zip(columns, values.T))
+        # The arrays are fresh copies (column-contiguous), so let pandas adopt them as-is.
+        frame = pd.DataFrame(data, copy=False)
+        self._frame_cache = (self.version, columns, frame)
+        return frame.copy(deep=False)
@@ -0,0 +1,148 @@
+"""
+modules/order_book.py
+---------------------
+Top-of-book snapshot kept as fixed-size NumPy arrays (structure of arrays),
+capped at the subscribed depth level. Depth frames are parsed straight into
+the pre-allocated arrays; the server's list of ``[price, size]`` string
+pairs is not retained. Incremental level changes can be applied in place
+with apply_delta()/apply_deltas().
+"""
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+
+class OrderBook:
+    """Bids (best first, descending) and asks (best first, ascending), ``depth`` levels each."""
+
+    __slots__ = ("depth", "bid_px", "bid_sz", "ask_px", "ask_sz", "n_bids", "n_asks", "ts")
+
+    def __init__(self, depth: int = 50) -> None:
+        self.depth = depth
+        self.bid_px = np.empty(depth, dtype=np.float64)
+        self.bid_sz = np.empty(depth, dtype=np.float64)
+        self.ask_px = np.empty(depth, dtype=np.float64)
+        self.ask_sz = np.empty(depth, dtype=np.float64)
+        self.n_bids = 0
+        self.n_asks = 0
+        self.ts = 0
+
+    def copy(self) -> "OrderBook":
+        """Independent copy, e.g. a snapshot handed to another thread."""
+        book = OrderBook.__new__(OrderBook)
+        book.depth = self.depth
+        book.bid_px = self.bid_px.copy()
+        book.bid_sz = self.bid_sz.copy()
+        book.ask_px = self.ask_px.copy()
+        book.ask_sz = self.ask_sz.copy()
+        book.n_bids = self.n_bids
+        book.n_asks = self.n_asks
+        book.ts = self.ts
+        return book
+
+    def _fill(self, levels: Sequence[Sequence[Any]], px: np.ndarray, sz: np.ndarray) -> int:
+        if not levels:
+            return 0
+        arr = np.asarray(levels[:self.depth], dtype=np.float64)
+        n = int(arr.shape[0])
+        px[:n] = arr[:, 0]
+        sz[:n] = arr[:, 1]
+        return n
+
+    def load_snapshot(self, data: Dict[str, Any]) -> None:
+        """Replace the book with the top ``depth`` levels of a depth frame."""
+        self.n_bids = self._fill(data.get("bids") or (), self.bid_px, self.bid_sz)
+        self.n_asks = self._fill(data.get("asks") or (), self.ask_px, self.ask_sz)
+        self.ts = int(data.get("timestamp") or data.get("ts") or 0)
+
+    def apply_delta(self, side: str, price: float, size: float) -> None:
+        """
+        Set one level of ``side`` ("bids" or "asks") to ``size``; a size of
+        0 removes it. The level is located with a binary search and the
+        arrays stay sorted best-first; a new level beyond ``depth`` is ignored.
+        """
+        if side == "bids":
+            px, sz, n = self.bid_px, self.bid_sz, self.n_bids
+            i = int(np.searchsorted(-px[:n], -price))  # descending prices
+        else:
+            px, sz, n = self.ask_px, self.ask_sz, self.n_asks
+            i = int(np.searchsorted(px[:n], price))
+        if i < n and px[i] == price:
+            if size > 0:
+                sz[i] = size
+                return
+            px[i:n - 1] = px[i + 1:n]
+            sz[i:n - 1] = sz[i + 1:n]
+            n -= 1
+        elif size > 0 and i < self.depth:
+            end = min(n, self.depth - 1)  # the worst level falls off a full book
+            px[i + 1:end + 1] = px[i:end]
+            sz[i + 1:end + 1] = sz[i:end]
+            px[i] = price
+            sz[i] = size
+            n = end + 1
+        else:
+            return
+        if side == "bids":
+            self.n_bids = n
+        else:
+            self.n_asks = n
+
+    def apply_deltas(self, data: Dict[str, Any]) -> None:
+        """Apply the ``[price, size]`` level changes of an incremental depth frame."""
+        for side in ("bids", "asks"):
+            for price, size in data.get(side) or ():
+                self.apply_delta(side, float(price), float(size))
+        self.ts = int(data.get("timestamp") or data.get("ts") or self.ts)
+
+    @property
+    def bids(self) -> np.ndarray:
+        """(n, 2) view of [price, size] bid levels."""
+        return np.column_stack((self.bid_px[:self.n_bids], self.bid_sz[:self.n_bids]))
+
+    @property
+    def asks(self) -> np.ndarray:
+        """(n, 2) view of [price, size] ask levels."""
+        return np.column_stack((self.ask_px[:self.n_asks], self.ask_sz[:self.n_asks]))
+
+    @property
+    def best_bid(self) -> float:
+        """Highest bid price (NaN when there are no bids)."""
+        return float(self.bid_px[0]) if self.n_bids else float("nan")
+
+    @property
+    def best_ask(self) -> float:
+        """Lowest ask price (NaN when there are no asks)."""
+        return float(self.ask_px[0]) if self.n_asks else float("nan")
+
+    @property
+    def spread(self) -> float:
+        """Best ask minus best bid (NaN when either side is empty)."""
+        return self.best_ask - self.best_bid
+
+    @property
+    def mid(self) -> float:
+        """Midpoint of best bid and best ask (NaN when either side is empty)."""
+        return (self.best_ask + self.best_bid) / 2
+
+    def cum_depth(self, side: str) -> np.ndarray:
+        """Cumulative size from the best level outwards; ``side`` is "bids" or "asks"."""
+        if side == "bids":
+            return np.cumsum(self.bid_sz[:self.n_bids])
+        return np.cumsum(self.ask_sz[:self.n_asks])
+
+    def vwap(self, side: str, size: float) -> float:
+        """
+        Average fill price for taking ``size`` from ``side`` ("bids" or
+        "asks"), walking levels from the best one; NaN if the book is too thin.
+        """
+        if side == "bids":
+            px, sz = self.bid_px[:self.n_bids], self.bid_sz[:self.n_bids]
+        else:
+            px, sz = self.ask_px[:self.n_asks], self.ask_sz[:self.n_asks]
+        cum = np.cumsum(sz)
+        if size <= 0 or not cum.size or cum[-1] < size:
+            return float("nan")
+        # Size taken per level: full levels up to the one that completes ``size``.
+        taken = np.clip(size - (cum - sz), 0.0, sz)
+        return float(np.dot(px, taken) / size)
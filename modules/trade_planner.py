@@ -25,16 +25,20 @@ class TradePlanner:
             logger.warning("No data_provider supplied; using empty data_by_tf.")
 
         planner = SLTPPlanner(entry_price=entry_price, symbol=symbol,
-                              data_by_timeframe=data_by_tf,
-                              fib_levels=fib_levels or {})
+                              data_by_timeframe=data_by_tf)
         planner.set_by_swing_levels()
         planner.set_by_atr()
+        if fib_levels:
+            planner.set_by_fibonacci(fib_levels)
         planner.validate_risk_reward()
         plan = planner.get_plan()
 
-        chosen = next((v for v in plan.values() if v.get("valid")), None)
-        if not chosen and plan:
-            chosen = next(iter(plan.values()))
+        # Single pass: highest RRR among valid methods, else the first method.
+        methods = [v for v in plan.values() if isinstance(v, dict)]
+        chosen = max((v for v in methods if v.get("valid")),
+                     key=lambda v: v.get("RRR", 0), default=None)
+        if chosen is None:
+            chosen = methods[0] if methods else {}
 
         sl = float(chosen.get("sl", entry_price*0.98))
         tp = float(chosen.get("tp", entry_price*1.02))
@@ -1,37 +1,60 @@
 # modules/trader.py
 import time
 import hashlib
+import hmac
 import requests
 import urllib.parse
 from typing import Optional
 
+from utils import json_codec
+
 
 class Trader:
     def __init__(
         self,
-        api_key: str,
-        secret_key: str,
+        api_key: Optional[str],
+        secret_key: Optional[str],
         base_url: str = "https://api.lbank.info",
         logger: Optional[object] = None,
+        signature_method: str = "MD5",
+        timeout: float = 5.0,
     ):
+        if signature_method not in ("MD5", "HmacSHA256"):
+            raise ValueError(f"Unsupported signature_method: {signature_method}")
         self.api_key = api_key
         self.secret_key = secret_key
         self.base_url = base_url
         self.logger = logger
+        self.signature_method = signature_method
+        # Keys are optional (signals-only deployments); signing then uses "".
+        self._secret_bytes = (secret_key or "").encode()
+        self._secret_tail = b"&secret_key=" + self._secret_bytes
+        self.timeout = timeout
+        # One pooled session keeps the TCP/TLS connection to the API warm.
+        self._session = requests.Session()
+
+    def close(self) -> None:
+        """Release the pooled HTTP connections."""
+        self._session.close()
 
     def _generate_signature(self, params: dict) -> str:
-        params = dict(sorted(params.items()))
-        encoded = urllib.parse.urlencode(params)
-        to_sign = encoded + "&secret_key=" + self.secret_key
-        return hashlib.md5(to_sign.encode()).hexdigest().upper()
+        encoded = urllib.parse.urlencode(sorted(params.items())).encode()
+        if self.signature_method == "HmacSHA256":
+            # OpenSSL dispatches SHA-256 to the CPU's SHA extensions when present.
+            return hmac.new(self._secret_bytes, encoded, hashlib.sha256).hexdigest().upper()
+        h = hashlib.md5(encoded)
+        h.update(self._secret_tail)
+        return h.hexdigest().upper()
 
     def _private_post(self, endpoint: str, params: dict):
         url = self.base_url + endpoint
         params["api_key"] = self.api_key
         params["timestamp"] = int(time.time() * 1000)
+        if self.signature_method != "MD5":
+            params["signature_method"] = self.signature_method
         params["sign"] = self._generate_signature(params)
-        resp = requests.post(url, data=params)
-        data = resp.json()
+        resp = self._session.post(url, data=params, timeout=self.timeout)
+        data = json_codec.loads(resp.content)
         if self.logger:
             self.logger.debug("LBANK POST %s %s -> %s", endpoint, params, data)
         return data
@@ -1,58 +1,61 @@
 import asyncio
-import json
+import inspect
+import os
 import logging
-from collections import defaultdict, deque
-from typing import Any, Callable, Dict, Optional
+import time
+import zlib
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, List, Optional, Union
 
+import numpy as np
 import pandas as pd
 import websockets
 
-from utils.utils import fetch_initial_kline
+from utils import json_codec
+from utils.config_manager import ConfigManager
+from utils.utils import HTTP_POOL_MAXSIZE, fetch_initial_kline
 from modules.indicator import IndicatorCalculator
-from utils.timeframe import normalize_tf
+from modules import indicator_kernels
+from modules.order_book import OrderBook
+from utils.timeframe import normalize_tf, tf_seconds
 from utils.logger import setup_logger
 
 
+# Static part of the pong reply; only the echoed ping value is serialized.
+_PONG_PREFIX = '{"action":"pong","pong":'
 
-class ConfigManager:
-    def __init__(self, config: Dict[str, Any]):
-        self.config = config
 
-    def get_ws_url(self) -> str:
-        return (
-            self.config.get("LBANK_API", {}).get("websocket_url")
-            or self.config.get("WEBSOCKET_URL")
-            or "wss://www.lbkex.net/ws/V2/"
-        )
-
-    def get(self, key: str, default: Any = None) -> Any:
-        return self.config.get(key, default)
-
-    def get_timeframe_mapping(self) -> Dict[str, str]:
-        return (
-            self.config.get("TIMEFRAME_MAPPING")
-            or self.config.get("WEBSOCKET_TIMEFRAME_CODES", {})
-            or {}
-        )
-
-    def get_rest_code_map(self) -> Dict[str, str]:
-        return (
-            self.config.get("rest_code_map")
-            or self.config.get("REST_TIMEFRAME_CODES")
-            or {}
-        )
+@lru_cache(maxsize=None)
+def _depth_frame(symbol: str, depth: int) -> str:
+    """Serialized depth subscription (cached: identical on every send)."""
+    return json_codec.dumps({
+        "action": "subscribe",
+        "subscribe": "depth",
+        "pair": symbol,
+        "depth": depth
+    })
 
-    def get_symbols(self) -> list:
-        return self.config.get("symbols") or self.config.get("SYMBOLS") or []
 
-    def get_timeframes(self) -> list:
-        return self.config.get("timeframes") or self.config.get("TIMEFRAMES") or []
+@lru_cache(maxsize=None)
+def _kbar_frame(symbol: str, ws_tf: str) -> str:
+    """Serialized kbar subscription (cached: identical on every send)."""
+    return json_codec.dumps({
+        "action": "subscribe",
+        "subscribe": "kbar",
+        "kbar": ws_tf,
+        "pair": symbol
+    })
 
-    def get_max_retries(self) -> int:
-        return int(self.config.get("WS_MAX_RETRIES", 5))
 
-    def get_depth_level(self) -> int:
-        return int(self.config.get("DEPTH_LEVEL", 50))
+def _compute_frame(values: np.ndarray, timestamps: np.ndarray, capacity: int) -> pd.DataFrame:
+    """
+    Full indicator pipeline on standalone OHLCV arrays. Top-level and free
+    of client state so it can run in a worker thread or, pickled, in a
+    worker process. Only the run_all() frame is built; the streaming
+    indicators are seeded lazily and so never touched here.
+    """
+    return IndicatorCalculator.from_array(values, timestamps, capacity=capacity).run_all().df
 
 
 class WebSocketClient:
@@ -60,7 +63,7 @@ class WebSocketClient:
         self,
         config: Dict[str, Any],
         logger: Optional[logging.Logger] = None,
-        message_callback: Optional[Callable[..., asyncio.Future]] = None,
+        message_callback: Optional[Callable[..., Any]] = None,
         trader: Any = None,
         strategy: Any = None,
         data_provider: Any = None,
@@ -73,10 +76,17 @@ class WebSocketClient:
         self.logger.info("✅ WebSocketClient initialized with URL: %s", self.url)
         
         self._message_callback = message_callback
-
-        self.url = self.config_mgr.get_ws_url()
+        # Set by set_message_callback(cb, blocking=True): the callback then runs
+        # in its own bounded thread pool on snapshots of the market state.
+        self._callback_blocking = False
+        self._cb_pool: Optional[ThreadPoolExecutor] = None
+        self.callback_workers = os.cpu_count() or 1
 
         self.timeframe_mapping = self.config_mgr.get_timeframe_mapping()
+        # WS kbar code (e.g. "hour1") -> canonical timeframe, for the kbar hot path.
+        self._ws_tf_to_canonical = {
+            code: normalize_tf(tf) for tf, code in self.timeframe_mapping.items()
+        }
         self.rest_code_map = self.config_mgr.get_rest_code_map()
         self.symbols = self.config_mgr.get_symbols()
         self.timeframes = self.config_mgr.get_timeframes()
@@ -86,10 +96,31 @@ class WebSocketClient:
         self.data_provider = data_provider
 
         self.df_store: Dict[tuple, IndicatorCalculator] = {}
-        self.order_books: Dict[str, dict] = defaultdict(dict)
-
-        self.queue: asyncio.Queue = asyncio.Queue()
+        self.depth_level = self.config_mgr.get_depth_level()
+        # One pre-allocated book per configured symbol, built before the
+        # first depth burst instead of on it.
+        self.order_books: Dict[str, OrderBook] = {
+            s: OrderBook(self.depth_level) for s in self.symbols
+        }
+
+        # Bounded: when the consumer falls behind, the oldest frames are dropped.
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=self.config_mgr.get_queue_max())
+        self.dropped_frames = 0
+        # Bad frames are counted; only the first and every 1000th is logged.
+        self.malformed_frames = 0
+        self.frame_errors = 0
+        # This many bad frames in a row drop the session and reconnect.
+        self.max_consec_errors = 100
+        self._consec_errors = 0
+        # Reconnect delay doubles from backoff_initial_s up to backoff_max_s;
+        # only a session that stayed up backoff_reset_after_s resets it.
+        self.backoff_initial_s = 1.0
+        self.backoff_max_s = 30.0
+        self.backoff_reset_after_s = 60.0
+        self.max_batch = self.config_mgr.get_max_batch()  # frames handled per consumer wake-up
         self.ws: Optional[websockets.WebSocketClientProtocol] = None
+        # Extra ws.recv() arguments, detected once on the first connect.
+        self._recv_kwargs: Optional[Dict[str, bool]] = None
 
         self.is_running = False
         self._stop = False
@@ -100,37 +131,113 @@ class WebSocketClient:
         self._listener_task: Optional[asyncio.Task] = None
         self._consumer_task: Optional[asyncio.Task] = None
 
-    def set_message_callback(self, cb: Callable[..., asyncio.Future]) -> None:
+        # Keys whose candles changed; recomputed off the frame consumer.
+        self._compute_q: asyncio.Queue = asyncio.Queue()
+        self._dirty: set = set()
+        self._compute_task: Optional[asyncio.Task] = None
+        self.compute_coalesce_s = 0.05
+        # Concurrent REST kline fetches during prefill; capped at the shared
+        # session's pool, so every fetch reuses a kept-alive connection.
+        self.prefill_concurrency = min(self.config_mgr.get_prefill_concurrency(), HTTP_POOL_MAXSIZE)
+        # Optional process pool for indicator refreshes; None uses the
+        # loop's default thread pool. Never used for socket I/O.
+        self._pool: Optional[Executor] = None
+        processes = self.config_mgr.get_compute_processes()
+        if processes > 0:
+            self._pool = ProcessPoolExecutor(max_workers=min(processes, os.cpu_count() or 1))
+
+        # External callbacks run as tasks (strong refs kept until done).
+        self._cb_tasks: set = set()
+        self.max_inflight_callbacks = 100
+        self.dropped_callbacks = 0
+        # Ticker messages collected while a consumer batch is being handled;
+        # None outside _handle_ws_batch (messages are dispatched one by one).
+        self._cb_batch: Optional[List[tuple]] = None
+        # Also hand the callback the frame's bytes and a zlib copy, encoded
+        # once per message, for fan-out to several downstream consumers.
+        self.broadcast_compressed = self.config_mgr.get_broadcast_compressed()
+        # (symbol, timeframe) keys refreshed eagerly; None means every key.
+        # Other keys are still computed on demand by get_df().
+        self._active_keys: Optional[set] = None
+        # Ticker channels routed to the message callback (O(1) membership test).
+        self._ticker_channels = frozenset("ticker." + s for s in self.symbols)
+        # Subscribe frames are identical on every (re)connect; serialize once.
+        self._sub_frames = self._build_sub_frames()
+
+        if indicator_kernels.NUMBA_AVAILABLE:
+            # Compile the kernels now rather than on the first live candle.
+            indicator_kernels.warmup()
+
+    def set_message_callback(self, cb: Callable[..., Any], blocking: bool = False) -> None:
+        """
+        By default the callback is called on the loop and awaited when it
+        returns an awaitable. With ``blocking=True`` it is a plain (CPU-heavy)
+        function run in a dedicated thread pool of ``callback_workers``
+        threads; it then receives read-only snapshots instead of the live
+        stores: ``{key: calc.snapshot()}`` and ``{symbol: OrderBook copy}``.
+        """
         self._message_callback = cb
+        self._callback_blocking = blocking
+        if blocking and self._cb_pool is None:
+            self._cb_pool = ThreadPoolExecutor(
+                max_workers=self.callback_workers, thread_name_prefix="ws-callback"
+            )
+
+    def enable_indicators(self, symbol: str, timeframe: str) -> None:
+        """Keep the indicator frame of ``(symbol, timeframe)`` refreshed eagerly."""
+        if self._active_keys is None:
+            self._active_keys = set()
+        self._active_keys.add((symbol, normalize_tf(timeframe)))
 
     def stop(self) -> None:
         self._stop = True
 
     async def run(self) -> None:
-        backoff = 1
+        backoff = self.backoff_initial_s
         while not self._stop:
+            started = time.monotonic()
             try:
                 await self._connect_once()
-                backoff = 1
+                # Only a session that stayed up resets the backoff, so a
+                # connection that drops right away cannot reconnect in a tight loop.
+                if time.monotonic() - started >= self.backoff_reset_after_s:
+                    backoff = self.backoff_initial_s
             except Exception as exc:
                 self.logger.exception("WS session crashed: %s", exc)
             if self._stop:
                 break
             await asyncio.sleep(backoff)
-            backoff = min(backoff * 2, 30)
+            backoff = min(backoff * 2, self.backoff_max_s)
         self.is_running = False
 
     async def _connect_once(self) -> None:
         self.is_running = True
         try:
-            async with websockets.connect(self.url, ping_interval=None) as ws:
+            # No permessage-deflate: small JSON frames gain little from it and
+            # every frame would pay a zlib inflate. Text frames are read as
+            # bytes (see listen_messages), so no UTF-8 decode either.
+            async with websockets.connect(
+                self.url,
+                ping_interval=None,
+                compression=None,
+                max_size=2 ** 20,
+                max_queue=256,
+            ) as ws:
                 self.ws = ws
+                if self._recv_kwargs is None:
+                    # websockets >= 13 can hand over text frames as raw bytes,
+                    # skipping the UTF-8 decode; json_codec.loads parses (and
+                    # validates) bytes directly.
+                    decode = "decode" in inspect.signature(ws.recv).parameters
+                    self._recv_kwargs = {"decode": False} if decode else {}
                 self.logger.info("✅ WS connect → %s", self.url)
 
                 # Start listener & consumer early to handle server responses (including pong)
                 self._listener_task = asyncio.create_task(self.listen_messages())
                 self._consumer_task = asyncio.create_task(self.process_message_queue())
                 self._hb_task = asyncio.create_task(self._heartbeat())
+                if self._compute_task is None or self._compute_task.done():
+                    self._compute_task = asyncio.create_task(self._compute_loop())
 
                 # Prefill data and subscribe to symbols/timeframes
                 await self.prefill_all_data()
@@ -151,16 +258,33 @@ class WebSocketClient:
             self.is_running = False
 
     async def graceful_shutdown(self) -> bool:
+        """
+        Stop the client's tasks and close the socket. Safe to call from one
+        of those tasks (e.g. a callback): the calling task is never cancelled
+        or awaited by itself.
+        """
         self._stop = True
         self.is_running = False
-        await self.queue.put(None)
-        for task in (self._hb_task, self._listener_task, self._consumer_task):
-            if task:
+        self._enqueue(None)
+        current = asyncio.current_task()
+        for task in (self._hb_task, self._listener_task, self._consumer_task, self._compute_task):
+            if task and task is not current:
                 task.cancel()
                 try:
                     await task
                 except asyncio.CancelledError:
                     pass
+        cb_tasks = [t for t in self._cb_tasks if t is not current]
+        for task in cb_tasks:
+            task.cancel()
+        if cb_tasks:
+            await asyncio.gather(*cb_tasks, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        if self._cb_pool is not None:
+            self._cb_pool.shutdown(wait=False)
+            self._cb_pool = None
         if self.ws:
             try:
                 await self.ws.close()
@@ -181,66 +305,97 @@ class WebSocketClient:
                 except Exception:
                     pass
                 break
+            self.logger.debug("📊 WS queue depth %d/%d (dropped %d)",
+                              self.queue.qsize(), self.queue.maxsize, self.dropped_frames)
             await asyncio.sleep(interval)
 
     async def prefill_all_data(self) -> None:
-        for symbol in self.symbols:
-            for tf in self.timeframes:
+        """
+        Prefill every (symbol, timeframe) concurrently: the blocking REST
+        calls run in worker threads, at most ``prefill_concurrency`` at once,
+        so startup costs about one round trip per batch instead of one per key.
+        """
+        sem = asyncio.Semaphore(self.prefill_concurrency)
+
+        async def prefill_one(symbol: str, tf: str) -> None:
+            async with sem:
                 await self.prefill_data(symbol, tf)
 
-    async def subscribe_all(self) -> None:
-        depth_level = self.config_mgr.get_depth_level()
+        jobs = []
         for symbol in self.symbols:
-            try:
-                depth_msg = {
-                    "action": "subscribe",
-                    "subscribe": "depth",
-                    "pair": symbol,
-                    "depth": depth_level
-                }
-                await self.ws.send(json.dumps(depth_msg))
-                self.logger.info("📡 Sent depth subscription → %s", symbol)
-            except Exception as e:
-                self.logger.error("❌ Failed to send depth subscription → %s: %s", symbol, e)
-
-            # Then kbar subscription for each timeframe
+            for tf in self.timeframes:
+                if self._is_fresh((symbol, tf)):
+                    self.logger.info("⏭️ %s @ %s still fresh; skipping prefill", symbol, tf)
+                    continue
+                jobs.append((symbol, tf))
+        results = await asyncio.gather(
+            *(prefill_one(symbol, tf) for symbol, tf in jobs), return_exceptions=True
+        )
+        for (symbol, tf), res in zip(jobs, results):
+            if isinstance(res, Exception):
+                self.logger.error("❌ Prefill failed for %s @ %s: %s", symbol, tf, res)
+
+    def _is_fresh(self, key: tuple) -> bool:
+        """
+        True when the ring for ``key`` already holds a bar from the last two
+        bar periods, e.g. after a short reconnect, so the REST prefill
+        can be skipped.
+        """
+        calc = self.df_store.get(key)
+        bar = tf_seconds(key[1])
+        if calc is None or not len(calc.ring) or not bar:
+            return False
+        last = calc.ring.last_ts
+        last_s = last / 1000 if last > 10**11 else float(last)  # epoch ms → s
+        return time.time() - last_s < 2 * bar
+
+    def _build_sub_frames(self) -> List[tuple]:
+        """
+        Serialize every subscription once: ``[(symbol, labels, frames), ...]``
+        with the depth frame first, then one kbar frame per mapped timeframe.
+        """
+        out = []
+        for symbol in self.symbols:
+            labels = ["depth"]
+            frames = [_depth_frame(symbol, self.depth_level)]
             for tf in self.timeframes:
                 ws_tf = self.timeframe_mapping.get(tf)
                 if ws_tf is None:
                     self.logger.warning("No WS code for timeframe %s – skipping", tf)
                     continue
-                try:
-                    kbar_msg = {
-                        "action": "subscribe",
-                        "subscribe": "kbar",
-                        "kbar": ws_tf,
-                        "pair": symbol
-                    }
-                    await self.ws.send(json.dumps(kbar_msg))
-                    self.logger.info("📡 Sent kbar subscription → %s @ %s", symbol, ws_tf)
-                except Exception as e:
-                    self.logger.error("❌ Failed to send kbar subscription → %s @ %s: %s", symbol, ws_tf, e)
-                await asyncio.sleep(0.1)  # small pacing delay
+                labels.append("kbar@" + ws_tf)
+                frames.append(_kbar_frame(symbol, ws_tf))
+            out.append((symbol, labels, frames))
+        return out
+
+    async def subscribe_all(self) -> None:
+        """
+        Send the depth + kbar subscriptions of each symbol together: the
+        pre-serialized frames are written in the same event-loop tick with
+        gather(), pacing only between symbols. LBank accepts one subscription
+        per frame, so the messages are not merged.
+        """
+        for symbol, labels, frames in self._sub_frames:
+            results = await asyncio.gather(
+                *(self.ws.send(frame) for frame in frames), return_exceptions=True
+            )
+            sent = []
+            for label, res in zip(labels, results):
+                if isinstance(res, Exception):
+                    self.logger.error("❌ Failed to send %s subscription → %s: %s", label, symbol, res)
+                else:
+                    sent.append(label)
+            self.logger.info("📡 Sent subscriptions → %s: %s", symbol, ", ".join(sent))
+            await asyncio.sleep(0.1)  # small pacing delay between symbols
 
     async def send_subscribe_msg(self, symbol: str, ws_tf: str, depth_level: int):
+        """Subscribe one pair to a kbar timeframe and its depth, sent together."""
         try:
-            kbar_msg = {
-                "action": "subscribe",
-                "subscribe": "kbar",
-                "kbar": ws_tf,
-                "pair": symbol
-            }
-            await self.ws.send(json.dumps(kbar_msg))
-            self.logger.info("📡 Sent kbar subscription → %s @ %s", symbol, ws_tf)
-
-            depth_msg = {
-                "action": "subscribe",
-                "subscribe": "depth",
-                "pair": symbol,
-                "depth": depth_level
-            }
-            await self.ws.send(json.dumps(depth_msg))
-            self.logger.info("📡 Sent depth subscription → %s", symbol)
+            await asyncio.gather(
+                self.ws.send(_kbar_frame(symbol, ws_tf)),
+                self.ws.send(_depth_frame(symbol, depth_level)),
+            )
+            self.logger.info("📡 Sent kbar + depth subscriptions → %s @ %s", symbol, ws_tf)
 
         except Exception as e:
             self.logger.error("❌ Failed to subscribe %s @ %s → %s", symbol, ws_tf, e)
@@ -251,21 +406,86 @@ class WebSocketClient:
         if not rest_tf:
             self.logger.warning("No REST code for timeframe %s; skipping prefill", timeframe)
             return
-        df = fetch_initial_kline(
+        loop = asyncio.get_running_loop()
+        df = await loop.run_in_executor(None, partial(
+            fetch_initial_kline,
             symbol=symbol,
             interval=canonical_tf,
             size=200,
             rest_code_map=self.rest_code_map,
             logger=self.logger,
-        )
-        calc = IndicatorCalculator(df)
-        calc.run_all()
-        self.df_store[(symbol, timeframe)] = calc
+        ))
+        # Column-wise load into the ring; the indicator frame is built by the
+        # compute worker instead of blocking the prefill loop.
+        key = (symbol, timeframe)
+        self.df_store[key] = IndicatorCalculator(df)
+        self._mark_dirty(key)
+
+    def _mark_dirty(self, key: tuple) -> None:
+        """Queue an active ``key`` for an indicator refresh unless already queued."""
+        if self._active_keys is not None and key not in self._active_keys:
+            return
+        if key not in self._dirty:
+            self._dirty.add(key)
+            self._compute_q.put_nowait(key)
+
+    async def _compute_loop(self) -> None:
+        """
+        Refresh the full indicator frame of each dirty (symbol, timeframe)
+        in a worker thread (or process, see COMPUTE_PROCESSES), so pandas
+        work never runs on the frame consumer.
+        Keys are coalesced: after a wake-up the loop waits ``compute_coalesce_s``
+        so intra-bar updates pile up, then refreshes each queued key once.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            keys = [await self._compute_q.get()]
+            await asyncio.sleep(self.compute_coalesce_s)
+            while not self._compute_q.empty():
+                keys.append(self._compute_q.get_nowait())
+            for key in keys:
+                self._dirty.discard(key)
+                calc = self.df_store.get(key)
+                if calc is None:
+                    continue
+                # Snapshot on the loop thread; the worker only sees its own copy.
+                ring = calc.ring
+                (values, timestamps), version = ring.ordered(), ring.version
+                try:
+                    df = await loop.run_in_executor(
+                        self._pool, _compute_frame, values, timestamps, ring.capacity
+                    )
+                except Exception as exc:
+                    self.logger.exception("Indicator refresh failed for %s: %s", key, exc)
+                    continue
+                calc.adopt(df, version)
+
+    def stats(self) -> Dict[str, int]:
+        """Backpressure counters of the receive → consume → callback pipeline."""
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_max": self.queue.maxsize,
+            "dropped_frames": self.dropped_frames,
+            "malformed_frames": self.malformed_frames,
+            "frame_errors": self.frame_errors,
+            "callbacks_in_flight": len(self._cb_tasks),
+            "dropped_callbacks": self.dropped_callbacks,
+            "dirty_keys": len(self._dirty),
+        }
+
+    def snapshot(self, key: tuple) -> Optional[Dict[str, float]]:
+        """Latest streaming indicator values for ``(symbol, timeframe)``, if tracked."""
+        calc = self.df_store.get(key)
+        return calc.snapshot() if calc else None
 
     async def listen_messages(self) -> None:
+        assert self.ws is not None, "listen_messages() needs a connected socket"
+        recv = self.ws.recv
+        recv_kwargs = self._recv_kwargs or {}
         try:
-            async for raw in self.ws:
-                await self.queue.put(raw)
+            while True:
+                raw = await recv(**recv_kwargs)
+                self._enqueue(raw)
         except websockets.exceptions.ConnectionClosed as e:
             level = self.logger.warning if e.code not in (1000, 1006) else self.logger.info
             level("WS closed (code=%s reason=%s)", e.code, e.reason)
@@ -273,30 +493,107 @@ class WebSocketClient:
             self.logger.exception("Listen loop crashed")
         finally:
             self.is_running = False
-            await self.queue.put(None)
+            self._enqueue(None)
+
+    def _enqueue(self, item: Any) -> None:
+        """put_nowait with a drop-oldest policy once the queue is full."""
+        try:
+            self.queue.put_nowait(item)
+            return
+        except asyncio.QueueFull:
+            pass
+        try:
+            self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        self.queue.put_nowait(item)
+        self.dropped_frames += 1
+        if self.dropped_frames % 500 == 1:
+            self.logger.warning(
+                "⚠️ WS queue full (%d): dropping oldest frames (%d dropped so far)",
+                self.queue.maxsize, self.dropped_frames,
+            )
 
     async def process_message_queue(self) -> None:
+        """
+        Consume queued frames in batches: after the first blocking get(), drain
+        whatever else is already queued (up to ``max_batch``) and handle it in
+        one pass, so bursts are not scheduled frame by frame.
+        """
         while True:
             try:
                 raw = await self.queue.get()
                 if raw is None:
                     break
-                await self._handle_ws_message(raw)
+                batch = [raw]
+                stop = False
+                while len(batch) < self.max_batch:
+                    try:
+                        raw = self.queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if raw is None:
+                        stop = True
+                        break
+                    batch.append(raw)
+                await self._handle_ws_batch(batch)
+                if stop:
+                    break
             except asyncio.CancelledError:
                 break
             except Exception as exc:
                 self.logger.exception("Queue consumer crashed: %s", exc)
 
-    async def _handle_ws_message(self, raw_msg: str) -> None:
+    async def _handle_ws_batch(self, batch: List[Union[str, bytes]]) -> None:
+        """
+        Handle a drained batch of frames. Ticker messages are collected and
+        handed to a single callback task per batch, instead of one task each.
+        """
+        self._cb_batch = []
         try:
-            msg = json.loads(raw_msg)
-        except Exception:
-            self.logger.warning("Malformed WS payload: %s", raw_msg)
+            for raw in batch:
+                malformed = self.malformed_frames
+                try:
+                    await self._handle_ws_message(raw)
+                except Exception as exc:
+                    self.frame_errors += 1
+                    if self.frame_errors % 1000 == 1:
+                        self.logger.exception(
+                            "Failed to handle WS frame (%d so far): %s", self.frame_errors, exc
+                        )
+                else:
+                    if self.malformed_frames == malformed:
+                        self._consec_errors = 0
+                        continue
+                self._consec_errors += 1
+                if self._consec_errors >= self.max_consec_errors:
+                    self.logger.error(
+                        "❌ %d bad WS frames in a row; dropping the session to reconnect",
+                        self._consec_errors,
+                    )
+                    self._consec_errors = 0
+                    self.is_running = False  # ends _connect_once; run() reconnects
+        finally:
+            group, self._cb_batch = self._cb_batch, None
+        if group:
+            self._spawn_callback(group)
+
+    async def _handle_ws_message(self, raw_msg: Union[str, bytes]) -> None:
+        try:
+            msg = json_codec.loads(raw_msg)
+        except ValueError:
+            msg = None
+        if not isinstance(msg, dict):
+            self.malformed_frames += 1
+            if self.malformed_frames % 1000 == 1:
+                self.logger.warning(
+                    "Malformed WS payload (%d so far): %.200r", self.malformed_frames, raw_msg
+                )
             return
 
         ping_val = msg.get("ping")
         if ping_val:
-            await self.ws.send(json.dumps({"action": "pong", "pong": ping_val}))
+            await self.ws.send(_PONG_PREFIX + json_codec.dumps(ping_val) + "}")
             return
 
         if msg.get("status") == "error":
@@ -308,24 +605,93 @@ class WebSocketClient:
 
         if subscribe_type == "kbar":
             symbol = data.get("symbol")
-            kbar_tf = msg.get("kbar")
-            canonical_tf = normalize_tf(kbar_tf or "")
+            kbar_tf = msg.get("kbar") or ""
+            canonical_tf = self._ws_tf_to_canonical.get(kbar_tf) or normalize_tf(kbar_tf)
             key = (symbol, canonical_tf)
 
             calc = self.df_store.get(key)
             if calc:
+                version = calc.ring.version
                 calc.update(data)
-                calc.run_all()
+                if calc.ring.version != version:
+                    self._mark_dirty(key)
 
         elif subscribe_type == "depth":
             symbol = data.get("symbol")
             if symbol:
-                self.order_books[symbol] = data
-
-        if self._message_callback and isinstance(msg, dict):
-            sub = msg.get("subscribe", "")
-            if isinstance(sub, str) and sub.startswith("ticker."):
-                try:
-                    await self._message_callback(msg, self.df_store, self.order_books)
-                except Exception as cb_exc:
-                    self.logger.exception("External message callback failed: %s", cb_exc)
+                book = self.order_books.get(symbol)
+                if book is None:
+                    book = self.order_books[symbol] = OrderBook(self.depth_level)
+                book.load_snapshot(data)
+
+        elif (
+            self._message_callback
+            and isinstance(subscribe_type, str)
+            and subscribe_type in self._ticker_channels
+        ):
+            if self._cb_batch is not None:
+                self._cb_batch.append((msg, raw_msg))
+            else:
+                self._spawn_callback([(msg, raw_msg)])
+
+    def _spawn_callback(self, group: List[tuple]) -> None:
+        """
+        Run the external callback for a group of ``(msg, raw)`` ticker
+        messages as one task, so a slow strategy never blocks the frame
+        consumer. At most ``max_inflight_callbacks`` tasks run at once;
+        beyond that the group is dropped with a warning.
+        """
+        if len(self._cb_tasks) >= self.max_inflight_callbacks:
+            before = self.dropped_callbacks
+            self.dropped_callbacks += len(group)
+            if before == 0 or before // 100 < self.dropped_callbacks // 100:
+                self.logger.warning(
+                    "⚠️ %d callbacks in flight: dropping ticker messages (%d dropped so far)",
+                    len(self._cb_tasks), self.dropped_callbacks,
+                )
+            return
+        task = asyncio.create_task(self._run_callback(group))
+        self._cb_tasks.add(task)
+        task.add_done_callback(self._cb_tasks.discard)
+
+    def _callback_kwargs(self, raw: Union[str, bytes]) -> Dict[str, bytes]:
+        if not self.broadcast_compressed:
+            return {}
+        # The raw frame already is the serialized message; no re-encode.
+        payload = raw.encode() if isinstance(raw, str) else bytes(raw)
+        return {"payload": payload, "payload_z": zlib.compress(payload, 1)}
+
+    async def _run_callback(self, group: List[tuple]) -> None:
+        """
+        Invoke the callback for each message of ``group``, in arrival order.
+        The callback is called on the loop and its result awaited when it is
+        awaitable; a blocking callback runs in the callback pool instead,
+        one hop for the whole group.
+        """
+        cb = self._message_callback
+        if cb is None:
+            return
+        if self._callback_blocking and self._cb_pool is not None:
+            # Snapshot on the loop thread: the worker never sees state the
+            # loop is still mutating.
+            store = {key: calc.snapshot() for key, calc in self.df_store.items()}
+            books = {symbol: book.copy() for symbol, book in self.order_books.items()}
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._cb_pool, self._run_blocking_callback, cb, group, store, books)
+            return
+        for msg, raw in group:
+            try:
+                result = cb(msg, self.df_store, self.order_books, **self._callback_kwargs(raw))
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as cb_exc:
+                self.logger.exception("External message callback failed: %s", cb_exc)
+
+    def _run_blocking_callback(self, cb: Callable[..., Any], group: List[tuple],
+                               store: Dict[tuple, Dict[str, float]],
+                               books: Dict[str, OrderBook]) -> None:
+        for msg, raw in group:
+            try:
+                cb(msg, store, books, **self._callback_kwargs(raw))
+            except Exception as cb_exc:
+                self.logger.exception("External message callback failed: %s", cb_exc)
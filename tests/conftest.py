@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def make_ohlcv(n: int = 200, seed: int = 0) -> pd.DataFrame:
+    """Random-walk kline frame with the column names of the REST/WS feeds."""
+    rng = np.random.default_rng(seed)
+    close = 30000 + rng.standard_normal(n).cumsum() * 20
+    open_ = close + rng.standard_normal(n) * 5
+    high = np.maximum(open_, close) + rng.random(n) * 10
+    low = np.minimum(open_, close) - rng.random(n) * 10
+    return pd.DataFrame({
+        "timestamp": np.arange(n) * 60,
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": rng.random(n),
+    })
+
+
+@pytest.fixture
+def ohlcv() -> pd.DataFrame:
+    return make_ohlcv()
@@ -0,0 +1,36 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from core.initialization import load_configuration
+
+
+@pytest.fixture
+def env_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    # load_dotenv(override=True) writes os.environ; monkeypatch restores it.
+    for key in ("SYMBOLS", "TIMEFRAMES", "WEBSOCKET_TIMEFRAME_CODES_1M"):
+        monkeypatch.setenv(key, "")
+    path = tmp_path / "config.env"
+    path.write_text("SYMBOLS=BTC_USDT\nTIMEFRAMES=1m\nWEBSOCKET_TIMEFRAME_CODES_1M=1min\n")
+    return path
+
+
+def test_reload_after_edit(env_file: Path) -> None:
+    assert load_configuration(str(env_file))["SYMBOLS"] == ["btc_usdt"]
+
+    env_file.write_text("SYMBOLS=BTC_USDT,ETH_USDT\nTIMEFRAMES=1m\nWEBSOCKET_TIMEFRAME_CODES_1M=1min\n")
+    mtime = os.path.getmtime(env_file) + 10  # coarse filesystem clocks
+    os.utime(env_file, (mtime, mtime))
+
+    assert load_configuration(str(env_file))["SYMBOLS"] == ["btc_usdt", "eth_usdt"]
+
+
+def test_callers_get_independent_copies(env_file: Path) -> None:
+    first = load_configuration(str(env_file))
+    first["SYMBOLS"].append("xrp_usdt")
+    first["WEBSOCKET_TIMEFRAME_CODES"]["5m"] = "5min"
+
+    second = load_configuration(str(env_file))
+    assert second["SYMBOLS"] == ["btc_usdt"]
+    assert second["WEBSOCKET_TIMEFRAME_CODES"] == {"1m": "1min"}
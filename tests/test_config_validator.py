@@ -0,0 +1,38 @@
+from typing import Any, Dict
+
+import pytest
+
+from utils.config_validator import validate_config
+
+
+def _config(**overrides: Any) -> Dict[str, Any]:
+    config: Dict[str, Any] = {
+        "SYMBOLS": ["btc_usdt"],
+        "TIMEFRAMES": ["1m"],
+        "WEBSOCKET_TIMEFRAME_CODES": {"1m": "1min"},
+        "REST_TIMEFRAME_CODES": {"1m": "minute1"},
+        "LBANK_API": {"api_key": None, "api_secret": None},
+    }
+    config.update(overrides)
+    return config
+
+
+def test_valid_config() -> None:
+    validate_config(_config())
+
+
+def test_missing_keys_are_listed() -> None:
+    config = _config(SYMBOLS=[])
+    del config["LBANK_API"]
+    with pytest.raises(ValueError, match=r"\['SYMBOLS', 'LBANK_API'\]"):
+        validate_config(config)
+
+
+@pytest.mark.parametrize("key, value", [
+    ("SYMBOLS", "btc_usdt"),
+    ("REST_TIMEFRAME_CODES", ["minute1"]),
+    ("LBANK_API", "key:secret"),
+])
+def test_wrong_types_are_rejected(key: str, value: Any) -> None:
+    with pytest.raises(TypeError, match=key):
+        validate_config(_config(**{key: value}))
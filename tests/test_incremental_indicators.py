@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.incremental_indicators import IncrementalIndicators
+from modules.indicator import IndicatorCalculator
+
+# Columns whose streaming value equals the full recompute's last row exactly.
+EXACT = ("close_price", "tenkan_sen", "kijun_sen", "rsi",
+         "boll_sma", "boll_std", "boll_upper", "boll_lower")
+# MACD streams adjust=False EMAs; run_all() uses adjust=True, which converges
+# to the same value once the start-up weights have decayed.
+CONVERGED = ("macd", "macd_signal", "macd_hist")
+
+
+def _assert_matches_run_all(snapshot: dict, frame: pd.DataFrame) -> None:
+    last = frame.iloc[-1]
+    for name in EXACT:
+        assert snapshot[name] == pytest.approx(last[name], rel=1e-9), name
+    for name in CONVERGED:
+        assert snapshot[name] == pytest.approx(last[name], abs=1e-3), name
+
+
+def test_snapshot_matches_run_all(ohlcv: pd.DataFrame) -> None:
+    calc = IndicatorCalculator(ohlcv)
+    _assert_matches_run_all(calc.snapshot(), calc.run_all().df)
+
+
+def test_update_matches_run_all(ohlcv: pd.DataFrame) -> None:
+    calc = IndicatorCalculator(ohlcv.iloc[:150], capacity=200)
+    for row in ohlcv.iloc[150:].to_dict("records"):
+        calc.update(row)
+    _assert_matches_run_all(calc.snapshot(), IndicatorCalculator(ohlcv).run_all().df)
+
+
+def test_streaming_state_is_seeded_lazily(ohlcv: pd.DataFrame) -> None:
+    calc = IndicatorCalculator(ohlcv)
+    calc.run_all()
+    assert calc._incremental is None
+
+    expected = IncrementalIndicators()
+    expected.seed(*(ohlcv[c].to_numpy(dtype=np.float64) for c in ("high", "low", "close")))
+    assert calc.snapshot() == pytest.approx(expected.snapshot(), nan_ok=True)
+
+
+def test_short_history_is_nan_until_window_fills(ohlcv: pd.DataFrame) -> None:
+    snapshot = IndicatorCalculator(ohlcv.iloc[:5]).snapshot()
+    assert np.isnan(snapshot["tenkan_sen"]) and np.isnan(snapshot["kijun_sen"])
+
+
+def test_rsi_and_bollinger_warm_up(ohlcv: pd.DataFrame) -> None:
+    ind = IncrementalIndicators()
+    closes = ohlcv["close"].to_numpy(dtype=np.float64)
+    for n, close in enumerate(closes[:ind.boll_period], start=1):
+        ind.update(close + 1.0, close - 1.0, close)
+        snapshot = ind.snapshot()
+        assert np.isnan(snapshot["rsi"]) == (n <= ind.rsi_period)
+        assert np.isnan(snapshot["boll_std"]) == (n < ind.boll_period)
+    assert snapshot["boll_sma"] == pytest.approx(closes[:ind.boll_period].mean(), rel=1e-12)
+
+
+def test_revise_replaces_newest_candle(ohlcv: pd.DataFrame) -> None:
+    high, low, close = (ohlcv[c].to_numpy(dtype=np.float64) for c in ("high", "low", "close"))
+    expected = IncrementalIndicators()
+    expected.seed(high, low, close)
+
+    revised = IncrementalIndicators()
+    rng = np.random.default_rng(1)
+    for h, l, c in zip(high, low, close):
+        # In-progress bar: first seen with other prices, revised (maybe
+        # several times) before it closes at the final values.
+        revised.update(h + 50, l - 50, c + 25)
+        for _ in range(rng.integers(0, 3)):
+            revised.revise(h + rng.random(), l - rng.random(), c + rng.random())
+        revised.revise(h, l, c)
+
+    assert revised.snapshot() == pytest.approx(expected.snapshot(), rel=1e-9, nan_ok=True)
+
+
+def test_revise_without_history_acts_as_update() -> None:
+    ind = IncrementalIndicators()
+    ind.revise(2.0, 1.0, 1.5)
+    assert ind.n == 1
+    assert ind.snapshot()["close_price"] == 1.5
+
+
+def test_calculator_revises_in_progress_candle(ohlcv: pd.DataFrame) -> None:
+    calc = IndicatorCalculator(ohlcv.iloc[:-1])
+    last = ohlcv.iloc[-1].to_dict()
+    calc.update({**last, "close": last["close"] + 100.0, "high": last["high"] + 100.0})
+    calc.update(last)  # same timestamp: replaces the candle above
+    assert calc.snapshot() == pytest.approx(IndicatorCalculator(ohlcv).snapshot(), rel=1e-9, nan_ok=True)
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules import indicator_kernels as k
+from modules.indicator import IndicatorCalculator
+
+
+def _close(ohlcv: pd.DataFrame) -> np.ndarray:
+    return np.array(ohlcv["close"], dtype=np.float64)
+
+
+@pytest.fixture(params=["bottleneck", "numpy"])
+def backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Run the moving-window tests with and without bottleneck."""
+    if request.param == "numpy":
+        monkeypatch.setattr(k, "bn", None)
+    elif k.bn is None:
+        pytest.skip("bottleneck not installed")
+    param: str = request.param
+    return param
+
+
+@pytest.mark.parametrize("name", ["max", "min", "mean", "std"])
+@pytest.mark.parametrize("window", [2, 9, 26])
+def test_moving_window_matches_rolling(ohlcv: pd.DataFrame, backend: str, name: str, window: int) -> None:
+    close = _close(ohlcv)
+    expected = getattr(pd.Series(close).rolling(window), name)().to_numpy()
+    got = getattr(k, f"move_{name}")(close, window)
+    # bottleneck's running std loses a few digits on ~3e4 prices over tiny windows.
+    np.testing.assert_allclose(got, expected, rtol=1e-9, atol=1e-6)
+
+
+def test_moving_window_shorter_than_window(backend: str) -> None:
+    assert np.isnan(k.move_max(np.arange(3.0), 5)).all()
+
+
+@pytest.mark.parametrize("periods", [-3, 0, 1, 26])
+def test_shift_matches_series_shift(ohlcv: pd.DataFrame, periods: int) -> None:
+    close = _close(ohlcv)
+    np.testing.assert_array_equal(k.shift(close, periods), pd.Series(close).shift(periods).to_numpy())
+
+
+def _wilder_rsi_pandas(close: np.ndarray, period: int) -> np.ndarray:
+    delta = pd.Series(close).diff()
+    gain = delta.clip(lower=0.0).to_numpy(copy=True)
+    loss = (-delta).clip(lower=0.0).to_numpy(copy=True)
+    gain[period] = gain[1:period + 1].mean()
+    loss[period] = loss[1:period + 1].mean()
+    avg_gain = pd.Series(gain[period:]).ewm(alpha=1.0 / period, adjust=False).mean().to_numpy()
+    avg_loss = pd.Series(loss[period:]).ewm(alpha=1.0 / period, adjust=False).mean().to_numpy()
+    out = np.full(len(close), np.nan)
+    out[period:] = 100.0 - 100.0 / (1.0 + avg_gain / (avg_loss + 1e-10))
+    return out
+
+
+def test_wilder_rsi_matches_pandas(ohlcv: pd.DataFrame) -> None:
+    close = _close(ohlcv)
+    np.testing.assert_allclose(k.wilder_rsi(close, 14), _wilder_rsi_pandas(close, 14), rtol=1e-9, atol=1e-9)
+
+
+def test_wilder_rsi_short_input_is_nan() -> None:
+    assert np.isnan(k.wilder_rsi(np.arange(10.0), 14)).all()
+
+
+def _macd_pandas(close: np.ndarray, fast: int, slow: int, signal: int) -> np.ndarray:
+    s = pd.Series(close)
+    line = s.ewm(span=fast).mean() - s.ewm(span=slow).mean()
+    sig = line.ewm(span=signal).mean()
+    return np.column_stack((line, sig, line - sig))
+
+
+def test_macd_matches_pandas_ewm(ohlcv: pd.DataFrame) -> None:
+    close = _close(ohlcv)
+    np.testing.assert_allclose(k.macd(close, 12, 26, 9), _macd_pandas(close, 12, 26, 9), rtol=1e-9, atol=1e-9)
+
+
+def test_macd_skips_leading_nan() -> None:
+    close = np.array([np.nan, np.nan, 1.0, 2.0, 3.0])
+    expected = _macd_pandas(close, 2, 3, 2)
+    np.testing.assert_allclose(k.macd(close, 2, 3, 2), expected, rtol=1e-9, atol=1e-9)
+
+
+def test_compute_all_matches_per_indicator_pandas(ohlcv: pd.DataFrame) -> None:
+    high = np.array(ohlcv["high"], dtype=np.float64)
+    low = np.array(ohlcv["low"], dtype=np.float64)
+    close = _close(ohlcv)
+    out = k.compute_all(high, low, close, 20, 10, 20, 14, 12, 26, 9)
+    assert out.shape == (len(close), len(k.FUSED_COLUMNS))
+    got = dict(zip(k.FUSED_COLUMNS, out.T))
+
+    s = pd.Series(close)
+    prev = s.shift()
+    tr = np.maximum.reduce([high - low, (high - prev).abs().to_numpy(), (low - prev).abs().to_numpy()])
+    macd = _macd_pandas(close, 12, 26, 9)
+    expected = {
+        "ema": s.ewm(span=20, adjust=False).mean().to_numpy(),
+        "tr": tr,
+        "atr": pd.Series(tr).rolling(10).mean().to_numpy(),
+        "boll_sma": s.rolling(20).mean().to_numpy(),
+        "boll_std": s.rolling(20).std().to_numpy(),
+        "rsi": _wilder_rsi_pandas(close, 14),
+        "macd": macd[:, 0],
+        "macd_signal": macd[:, 1],
+        "macd_hist": macd[:, 2],
+    }
+    for name in k.FUSED_COLUMNS:
+        np.testing.assert_allclose(got[name], expected[name], rtol=1e-9, atol=1e-9, err_msg=name)
+
+
+def test_compute_all_matches_indicator_methods(ohlcv: pd.DataFrame) -> None:
+    fused = IndicatorCalculator(ohlcv).compute_all().df
+    split = (IndicatorCalculator(ohlcv).calculate_keltner().calculate_bollinger()
+             .calculate_rsi().calculate_macd().df)
+    for name in k.FUSED_COLUMNS + ("keltner_upper", "keltner_lower", "boll_upper", "boll_lower"):
+        np.testing.assert_allclose(fused[name], split[name], rtol=1e-9, atol=1e-9, err_msg=name)
@@ -0,0 +1,100 @@
+import math
+
+import numpy as np
+
+from modules.order_book import OrderBook
+
+
+def _book(depth: int = 5) -> OrderBook:
+    book = OrderBook(depth)
+    book.load_snapshot({
+        "bids": [["100", "1"], ["99", "2"], ["97", "3"]],
+        "asks": [["101", "1"], ["102", "2"], ["104", "3"]],
+        "timestamp": 1,
+    })
+    return book
+
+
+def test_load_snapshot() -> None:
+    book = _book()
+    np.testing.assert_array_equal(book.bids, [[100, 1], [99, 2], [97, 3]])
+    np.testing.assert_array_equal(book.asks, [[101, 1], [102, 2], [104, 3]])
+    assert (book.best_bid, book.best_ask, book.ts) == (100.0, 101.0, 1)
+    assert book.spread == 1.0 and book.mid == 100.5
+
+
+def test_load_snapshot_caps_at_depth() -> None:
+    book = OrderBook(2)
+    book.load_snapshot({"bids": [["3", "1"], ["2", "1"], ["1", "1"]], "asks": []})
+    np.testing.assert_array_equal(book.bids, [[3.0, 1.0], [2.0, 1.0]])
+    assert book.n_asks == 0
+    assert math.isnan(book.best_ask) and math.isnan(book.spread)
+
+
+def test_load_snapshot_replaces_previous_levels() -> None:
+    book = _book()
+    book.load_snapshot({"bids": [["50", "1"]], "asks": None, "ts": 2})
+    np.testing.assert_array_equal(book.bids, [[50, 1]])
+    assert book.n_asks == 0 and book.ts == 2
+
+
+def test_cum_depth_and_vwap() -> None:
+    book = _book()
+    np.testing.assert_array_equal(book.cum_depth("bids"), [1, 3, 6])
+    np.testing.assert_array_equal(book.cum_depth("asks"), [1, 3, 6])
+    assert book.vwap("bids", 2.0) == (100 * 1 + 99 * 1) / 2
+    assert book.vwap("asks", 6.0) == (101 * 1 + 102 * 2 + 104 * 3) / 6
+    assert math.isnan(book.vwap("bids", 100.0))  # book too thin
+    assert math.isnan(book.vwap("asks", 0.0))
+
+
+def test_aggregates_of_empty_book() -> None:
+    book = OrderBook(3)
+    assert math.isnan(book.mid) and math.isnan(book.vwap("bids", 1.0))
+    assert book.cum_depth("asks").size == 0
+
+
+def test_insert_keeps_sides_sorted() -> None:
+    book = _book()
+    book.apply_delta("bids", 98.0, 5.0)
+    book.apply_delta("bids", 100.5, 1.0)
+    book.apply_delta("asks", 103.0, 4.0)
+    book.apply_delta("asks", 100.8, 0.5)
+    np.testing.assert_array_equal(book.bids[:, 0], [100.5, 100, 99, 98, 97])
+    np.testing.assert_array_equal(book.asks[:, 0], [100.8, 101, 102, 103, 104])
+    assert book.best_bid == 100.5 and book.best_ask == 100.8
+
+
+def test_update_and_remove_levels() -> None:
+    book = _book()
+    book.apply_delta("bids", 99.0, 7.0)
+    book.apply_delta("asks", 101.0, 0.0)
+    book.apply_delta("asks", 150.0, 0.0)  # absent level: no-op
+    np.testing.assert_array_equal(book.bids, [[100, 1], [99, 7], [97, 3]])
+    np.testing.assert_array_equal(book.asks, [[102, 2], [104, 3]])
+
+
+def test_full_book_drops_worst_level() -> None:
+    book = _book(depth=3)
+    book.apply_delta("bids", 98.0, 1.0)  # between levels: 97 falls off
+    book.apply_delta("bids", 90.0, 1.0)  # worse than every level: ignored
+    np.testing.assert_array_equal(book.bids[:, 0], [100, 99, 98])
+    book.apply_delta("asks", 100.5, 1.0)
+    np.testing.assert_array_equal(book.asks[:, 0], [100.5, 101, 102])
+
+
+def test_remove_last_level_empties_side() -> None:
+    book = OrderBook(3)
+    book.apply_delta("bids", 10.0, 1.0)
+    book.apply_delta("bids", 10.0, 0.0)
+    assert book.n_bids == 0 and math.isnan(book.best_bid)
+
+
+def test_apply_deltas() -> None:
+    book = _book()
+    book.apply_deltas({"bids": [["100", "0"], ["98", "4"]], "asks": [["105", "1"]], "ts": 7})
+    assert book.ts == 7
+    np.testing.assert_array_equal(book.bids, [[99, 2], [98, 4], [97, 3]])
+    np.testing.assert_array_equal(book.asks[:, 0], [101, 102, 104, 105])
+    book.apply_deltas({"asks": []})  # no timestamp: keeps the previous one
+    assert book.ts == 7
@@ -0,0 +1,88 @@
+import hashlib
+import hmac
+import urllib.parse
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from core.initialization import initialize_components, load_configuration
+from modules.trader import Trader
+
+PARAMS = {"symbol": "btc_usdt", "type": "buy", "amount": "1", "api_key": "k", "timestamp": 1700000000000}
+
+
+class _FakeSession:
+    """Records the POSTed form instead of sending it."""
+
+    def __init__(self) -> None:
+        self.sent: Dict[str, Any] = {}
+
+    def post(self, url: str, data: Dict[str, Any], timeout: float) -> Any:
+        self.sent = dict(data)
+
+        class _Response:
+            content = b'{"result": true}'
+        return _Response()
+
+    def close(self) -> None:
+        pass
+
+
+def _query(params: Dict[str, Any]) -> bytes:
+    return urllib.parse.urlencode(sorted(params.items())).encode()
+
+
+def test_md5_signature() -> None:
+    trader = Trader("k", "s3cret")
+    expected = hashlib.md5(_query(PARAMS) + b"&secret_key=s3cret").hexdigest().upper()
+    assert trader._generate_signature(dict(PARAMS)) == expected
+    # Key order of the request does not matter: parameters are sorted.
+    assert trader._generate_signature(dict(reversed(list(PARAMS.items())))) == expected
+
+
+def test_hmac_sha256_signature() -> None:
+    trader = Trader("k", "s3cret", signature_method="HmacSHA256")
+    expected = hmac.new(b"s3cret", _query(PARAMS), hashlib.sha256).hexdigest().upper()
+    assert trader._generate_signature(dict(PARAMS)) == expected
+
+
+def test_unsupported_signature_method() -> None:
+    with pytest.raises(ValueError):
+        Trader("k", "s", signature_method="SHA1")
+
+
+@pytest.mark.parametrize("method", ["MD5", "HmacSHA256"])
+def test_private_post_signs_request(method: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    trader = Trader("k", "s3cret", signature_method=method)
+    session = _FakeSession()
+    monkeypatch.setattr(trader, "_session", session)
+    assert trader.get_balance() == {"result": True}
+
+    sent = session.sent
+    sign = sent.pop("sign")
+    assert sent["api_key"] == "k"
+    assert ("signature_method" in sent) == (method == "HmacSHA256")
+    assert sign == trader._generate_signature(sent)
+
+
+def test_trader_without_api_keys() -> None:
+    trader = Trader(api_key=None, secret_key=None)
+    try:
+        assert trader._generate_signature({"symbol": "btc_usdt"})
+    finally:
+        trader.close()
+
+
+def test_components_start_without_api_keys(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # A signals-only deployment: no LBANK_API_* credentials configured.
+    for key in ("LBANK_API_API_KEY", "LBANK_API_API_SECRET"):
+        monkeypatch.delenv(key, raising=False)
+    for key in ("SYMBOLS", "TIMEFRAMES", "WEBSOCKET_TIMEFRAME_CODES_1M"):
+        monkeypatch.setenv(key, "")
+    env = tmp_path / "config.env"
+    env.write_text("SYMBOLS=BTC_USDT\nTIMEFRAMES=1m\nWEBSOCKET_TIMEFRAME_CODES_1M=1min\n")
+
+    config = load_configuration(str(env))
+    assert config["LBANK_API"]["api_secret"] is None
+    assert initialize_components(config)["websocket_client"] is not None
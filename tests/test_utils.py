@@ -0,0 +1,39 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from utils import utils
+
+
+@pytest.fixture
+def signals_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    monkeypatch.chdir(tmp_path)
+    with sqlite3.connect("signals.db") as db:
+        db.execute("CREATE TABLE signals (id INTEGER, symbol TEXT, interval TEXT,"
+                   " timestamp INTEGER, price REAL, signal TEXT)")
+        db.executemany("INSERT INTO signals VALUES (?, ?, ?, ?, ?, ?)",
+                       [(i, "btc_usdt", "1m", i, 100.0 + i, "BUY") for i in range(60)])
+    utils._close_signals_db()
+    yield tmp_path
+    utils._close_signals_db()
+
+
+def test_dashboard_from_worker_threads(signals_dir: Path) -> None:
+    paths = [str(signals_dir / f"dashboard_{i}.html") for i in range(16)]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(utils.update_dashboard, paths))
+    for path in paths:
+        html = Path(path).read_text(encoding="utf-8")
+        assert html.count("<tr><td>") == 50  # latest 50 signals, from one shared connection
+        assert "<td>59</td>" in html and "<td>9</td>" not in html
+
+
+def test_signals_db_closes_and_reopens(signals_dir: Path) -> None:
+    first = utils._signals_db()
+    utils._close_signals_db()
+    with pytest.raises(sqlite3.ProgrammingError):
+        first.execute("SELECT 1")
+    assert utils._signals_db() is not first
@@ -0,0 +1,224 @@
+import asyncio
+import threading
+from typing import Any, List, Union
+
+import numpy as np
+import pandas as pd
+import pytest
+from websockets.exceptions import ConnectionClosed
+
+from modules import websocket_client_real_time as wsc
+from modules.indicator import IndicatorCalculator
+from modules.websocket_client_real_time import WebSocketClient
+
+
+@pytest.fixture
+def client() -> WebSocketClient:
+    return WebSocketClient({"SYMBOLS": ["btc_usdt"]})
+
+
+def _run_sessions(client: WebSocketClient, sessions: int, monkeypatch: pytest.MonkeyPatch) -> List[float]:
+    """Drive run() through ``sessions`` instant sessions; returns the reconnect delays."""
+    delays: List[float] = []
+    calls = 0
+
+    async def connect_once() -> None:
+        nonlocal calls
+        calls += 1
+        if calls == sessions:
+            client.stop()
+
+    async def sleep(delay: float) -> None:
+        delays.append(delay)
+
+    monkeypatch.setattr(client, "_connect_once", connect_once)
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    asyncio.run(client.run())
+    return delays
+
+
+def test_short_sessions_back_off_exponentially(client: WebSocketClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert _run_sessions(client, 8, monkeypatch) == [1, 2, 4, 8, 16, 30, 30]
+
+
+def test_stable_session_resets_backoff(client: WebSocketClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    client.backoff_reset_after_s = 0.0  # every session counts as stable
+    assert _run_sessions(client, 4, monkeypatch) == [1, 1, 1]
+
+
+def test_bad_frame_run_drops_session(client: WebSocketClient) -> None:
+    client.max_consec_errors = 5
+    client.is_running = True
+    good: Union[str, bytes] = b'{"status":"ok"}'
+    bad: Union[str, bytes] = b"not json"
+
+    asyncio.run(client._handle_ws_batch([bad] * 4 + [good] + [bad] * 4))
+    assert client.is_running  # the good frame reset the run
+    assert client.malformed_frames == 8
+
+    asyncio.run(client._handle_ws_batch([bad]))
+    assert not client.is_running
+    assert client._consec_errors == 0
+
+
+class _FakeSocket:
+    """Hands out ``frames`` from recv(), then reports the connection closed."""
+
+    def __init__(self, frames: List[str]) -> None:
+        self.frames = frames
+        self.recv_kwargs: List[Any] = []
+
+    async def recv(self, decode: Any = None) -> Union[str, bytes]:
+        self.recv_kwargs.append(decode)
+        if not self.frames:
+            raise ConnectionClosed(None, None)
+        frame = self.frames.pop(0)
+        return frame.encode() if decode is False else frame
+
+
+def _drain(client: WebSocketClient) -> List[Any]:
+    items = []
+    while not client.queue.empty():
+        items.append(client.queue.get_nowait())
+    return items
+
+
+def test_listen_reads_raw_bytes_when_supported(client: WebSocketClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    ws = _FakeSocket(['{"ping":"a"}', '{"ping":"b"}'])
+    monkeypatch.setattr(client, "ws", ws)
+    client._recv_kwargs = {"decode": False}
+    client.is_running = True
+
+    asyncio.run(client.listen_messages())
+    assert ws.recv_kwargs == [False, False, False]
+    assert _drain(client) == [b'{"ping":"a"}', b'{"ping":"b"}', None]
+    assert not client.is_running
+
+
+def test_full_queue_drops_oldest_frames() -> None:
+    client = WebSocketClient({"SYMBOLS": ["btc_usdt"], "WS_QUEUE_MAX": 3})
+    for i in range(5):
+        client._enqueue(f"frame {i}")
+    assert client.dropped_frames == 2
+    assert _drain(client) == ["frame 2", "frame 3", "frame 4"]
+    assert client.stats()["dropped_frames"] == 2
+
+
+def _kbar(symbol: str, row: dict) -> str:
+    return wsc.json_codec.dumps({"subscribe": "kbar", "kbar": "1min", "data": {**row, "symbol": symbol}})
+
+
+def test_dirty_keys_are_queued_once(client: WebSocketClient) -> None:
+    client._mark_dirty(("btc_usdt", "1m"))
+    client._mark_dirty(("btc_usdt", "1m"))
+    client.enable_indicators("eth_usdt", "1m")
+    client._mark_dirty(("btc_usdt", "1m"))  # still queued; now also inactive
+    client._mark_dirty(("xrp_usdt", "1m"))  # inactive: never queued
+    assert client._compute_q.qsize() == 1 and client._dirty == {("btc_usdt", "1m")}
+
+
+def test_compute_loop_coalesces_updates_per_key(client: WebSocketClient, ohlcv: pd.DataFrame,
+                                               monkeypatch: pytest.MonkeyPatch) -> None:
+    rows = ohlcv.to_dict("records")
+    keys = [("btc_usdt", "1m"), ("eth_usdt", "1m")]
+    for key in keys:
+        client.df_store[key] = IndicatorCalculator(ohlcv.iloc[:190])
+
+    computed: List[int] = []
+    real_compute_frame = wsc._compute_frame
+
+    def compute_frame(values: np.ndarray, timestamps: np.ndarray, capacity: int) -> pd.DataFrame:
+        computed.append(len(values))
+        return real_compute_frame(values, timestamps, capacity)
+
+    monkeypatch.setattr(wsc, "_compute_frame", compute_frame)
+
+    client.compute_coalesce_s = 0.2
+    frames = [_kbar("btc_usdt", row) for row in rows[190:195]]  # new bars...
+    frames.append(_kbar("btc_usdt", {**rows[194], "close": rows[194]["close"] + 1}))  # ...a revision
+    frames.append(_kbar("eth_usdt", rows[190]))
+
+    async def main() -> None:
+        task = asyncio.create_task(client._compute_loop())
+        for frame in frames:
+            await client._handle_ws_message(frame)
+            await asyncio.sleep(0.01)  # the compute loop wakes up in between
+        await asyncio.sleep(client.compute_coalesce_s + 0.5)
+        task.cancel()
+
+    asyncio.run(main())
+    assert sorted(computed) == [191, 195]  # one refresh per key, of its latest state
+    for key in keys:
+        calc = client.df_store[key]
+        assert not calc._stale and calc._computed_version == calc.ring.version
+    assert client.df_store[keys[0]].df["close_price"].iloc[-1] == rows[194]["close"] + 1
+
+
+def _ticker(symbol: str, n: int) -> tuple:
+    msg = {"subscribe": "ticker." + symbol, "data": {"n": n}}
+    return msg, wsc.json_codec.dumps(msg)
+
+
+def test_callbacks_beyond_inflight_cap_are_dropped(client: WebSocketClient) -> None:
+    seen: List[int] = []
+
+    async def main() -> None:
+        release = asyncio.Event()
+
+        async def callback(msg: dict, store: Any, books: Any) -> None:
+            await release.wait()
+            seen.append(msg["data"]["n"])
+
+        client.set_message_callback(callback)
+        client.max_inflight_callbacks = 2
+        for n in range(5):
+            client._spawn_callback([_ticker("btc_usdt", n)])
+        assert len(client._cb_tasks) == 2 and client.dropped_callbacks == 3
+
+        release.set()
+        await asyncio.gather(*client._cb_tasks)
+        assert not client._cb_tasks  # finished tasks free their slots
+        client._spawn_callback([_ticker("btc_usdt", 5)])
+        await asyncio.gather(*client._cb_tasks)
+
+    asyncio.run(main())
+    assert seen == [0, 1, 5]
+    assert client.stats()["dropped_callbacks"] == 3
+
+
+def test_async_and_awaitable_callbacks_are_awaited(client: WebSocketClient) -> None:
+    seen: List[int] = []
+
+    async def record(n: int) -> None:
+        seen.append(n)
+
+    def returns_awaitable(msg: dict, store: Any, books: Any) -> Any:
+        return record(msg["data"]["n"])  # plain function handing back a coroutine
+
+    async def main() -> None:
+        client.set_message_callback(returns_awaitable)
+        await client._run_callback([_ticker("btc_usdt", 1), _ticker("btc_usdt", 2)])
+
+    asyncio.run(main())
+    assert seen == [1, 2]
+
+
+def test_blocking_callback_gets_snapshots_off_the_loop(client: WebSocketClient, ohlcv: pd.DataFrame) -> None:
+    client.df_store[("btc_usdt", "1m")] = IndicatorCalculator(ohlcv)
+    client.order_books["btc_usdt"].load_snapshot({"bids": [["100", "1"]], "asks": [["101", "1"]]})
+    calls: List[Any] = []
+
+    def blocking(msg: dict, store: Any, books: Any) -> None:
+        calls.append((threading.current_thread().name, store, books))
+
+    async def main() -> None:
+        client.set_message_callback(blocking, blocking=True)
+        await client._run_callback([_ticker("btc_usdt", 1)])
+        await client.graceful_shutdown()
+
+    asyncio.run(main())
+    (thread, store, books), = calls
+    assert thread.startswith("ws-callback")
+    assert store[("btc_usdt", "1m")] == client.df_store[("btc_usdt", "1m")].snapshot()
+    assert books["btc_usdt"] is not client.order_books["btc_usdt"]
+    assert books["btc_usdt"].best_bid == 100.0
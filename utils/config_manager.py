@@ -39,4 +39,19 @@ class ConfigManager:
         return int(self.config.get("WS_MAX_RETRIES", 5))
 
     def get_depth_level(self) -> int:
-        return int(self.config.get("DEPTH_LEVEL", 50))
\ No newline at end of file
+        return int(self.config.get("DEPTH_LEVEL", 50))
+
+    def get_queue_max(self) -> int:
+        return int(self.config.get("WS_QUEUE_MAX", 2048))
+
+    def get_max_batch(self) -> int:
+        return max(1, int(self.config.get("WS_MAX_BATCH", 64)))
+
+    def get_prefill_concurrency(self) -> int:
+        return max(1, int(self.config.get("PREFILL_CONCURRENCY", 8)))
+
+    def get_compute_processes(self) -> int:
+        return int(self.config.get("COMPUTE_PROCESSES", 0))
+
+    def get_broadcast_compressed(self) -> bool:
+        return bool(self.config.get("WS_BROADCAST_COMPRESSED", False))
@@ -1,24 +1,18 @@
-def validate_config(config: dict):
-    required_keys = [
-        "WEBSOCKET_TIMEFRAME_CODES",
-        "SYMBOLS",
-        "TIMEFRAMES",
-        "REST_TIMEFRAME_CODES",
-        "LBANK_API"
-    ]
+# Required keys and their expected types, checked in this order.
+_SCHEMA = (
+    ("WEBSOCKET_TIMEFRAME_CODES", dict, "WEBSOCKET_TIMEFRAME_CODES must be a dictionary."),
+    ("SYMBOLS", list, "SYMBOLS must be a non-empty list."),
+    ("TIMEFRAMES", list, "TIMEFRAMES must be a non-empty list."),
+    ("REST_TIMEFRAME_CODES", dict, "REST_TIMEFRAME_CODES must be a dictionary."),
+    ("LBANK_API", dict, "LBANK_API must be a dictionary."),
+)
 
-    missing = [k for k in required_keys if k not in config or not config[k]]
+
+def validate_config(config: dict) -> None:
+    missing = [key for key, _, _ in _SCHEMA if not config.get(key)]
     if missing:
         raise ValueError(f"Missing required configuration keys: {missing}")
 
-    if not isinstance(config["SYMBOLS"], list) or not config["SYMBOLS"]:
-        raise TypeError("SYMBOLS must be a non-empty list.")
-
-    if not isinstance(config["TIMEFRAMES"], list) or not config["TIMEFRAMES"]:
-        raise TypeError("TIMEFRAMES must be a non-empty list.")
-
-    if not isinstance(config["WEBSOCKET_TIMEFRAME_CODES"], dict):
-        raise TypeError("WEBSOCKET_TIMEFRAME_CODES must be a dictionary.")
-
-    if not isinstance(config["REST_TIMEFRAME_CODES"], dict):
-        raise TypeError("REST_TIMEFRAME_CODES must be a dictionary.")
+    for key, expected, message in _SCHEMA:
+        if not isinstance(config[key], expected):
+            raise TypeError(message)
@@ -0,0 +1,32 @@
+"""
+utils/json_codec.py
+-------------------
+JSON encode/decode used on the WebSocket and REST hot paths. Backed by
+``orjson`` when it is installed (optional), otherwise the standard library.
+
+``loads`` accepts ``str`` or ``bytes``. ``dumps`` always returns ``str`` so
+outbound payloads are sent as WebSocket *text* frames.
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:  # optional speed-up
+    ORJSON_AVAILABLE = False
+
+
+if ORJSON_AVAILABLE:
+    def loads(data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+else:
+    def loads(data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"))
@@ -1,21 +1,95 @@
 # utils/logger.py
+import atexit
+import functools
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional, Tuple
 
 _DEFAULT_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 _DEFAULT_FILE  = os.getenv("LOG_FILE", "logs/bot.log")
 _DEFAULT_MAX_MB = int(os.getenv("LOG_MAX_MB", "5"))      # 5 MB
 _DEFAULT_BACKUPS = int(os.getenv("LOG_BACKUPS", "5"))    # keep 5 rotated files
 
+_FORMATTER = logging.Formatter(
+    fmt="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
 
+# One queue and one listener thread for the whole process. The listener owns
+# every sink: one RotatingFileHandler per file path and a single console
+# handler, so loggers sharing a file never rotate it independently.
+_LOG_QUEUE: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_LISTENER: Optional[QueueListener] = None
+_FILE_SINKS: Dict[str, logging.Handler] = {}
+_CONSOLE_SINK: Optional[logging.Handler] = None
+
+
+class _RoutingHandler(logging.Handler):
+    """Listener-side handler: passes each record to the sinks its logger chose."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        for sink in getattr(record, "sinks", ()):
+            sink.handle(record)
+
+
+class _SinkQueueHandler(QueueHandler):
+    """Logger-side handler: tags each record with its sinks and enqueues it."""
+
+    def __init__(self, sinks: Tuple[logging.Handler, ...]):
+        super().__init__(_LOG_QUEUE)
+        self.sinks = sinks
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = super().prepare(record)
+        setattr(record, "sinks", self.sinks)
+        return record
+
+
+def _file_sink(log_file: str) -> logging.Handler:
+    sink = _FILE_SINKS.get(log_file)
+    if sink is None:
+        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        sink = _FILE_SINKS[log_file] = RotatingFileHandler(
+            log_file,
+            maxBytes=_DEFAULT_MAX_MB * 1024 * 1024,
+            backupCount=_DEFAULT_BACKUPS,
+            encoding="utf-8"
+        )
+        sink.setFormatter(_FORMATTER)
+    return sink
+
+
+def _console_sink() -> logging.Handler:
+    global _CONSOLE_SINK
+    if _CONSOLE_SINK is None:
+        _CONSOLE_SINK = logging.StreamHandler()
+        _CONSOLE_SINK.setFormatter(_FORMATTER)
+    return _CONSOLE_SINK
+
+
+def _ensure_listener() -> None:
+    global _LISTENER
+    if _LISTENER is None:
+        _LISTENER = QueueListener(_LOG_QUEUE, _RoutingHandler())
+        _LISTENER.start()
+        atexit.register(_LISTENER.stop)  # flush what is still queued on exit
+
+
+@functools.lru_cache(maxsize=None)
 def setup_logger(name: str,
                  level: str or int = _DEFAULT_LEVEL,
                  log_file: str or None = _DEFAULT_FILE,
                  to_console: bool = True) -> logging.Logger:
     """
     Create/get a logger with both console and rotating-file handlers.
-    Re-using the same name returns the same configured logger (no duplicate handlers).
+    Re-using the same name returns the same configured logger (no duplicate handlers);
+    repeat calls with the same arguments are served from a cache.
+
+    Records go through a QueueHandler into the process-wide queue; the single
+    background QueueListener thread does the console/file writes, so logging
+    never blocks the event loop on I/O.
     """
     logger = logging.getLogger(name)
     if logger.handlers:  # already configured
@@ -26,30 +100,17 @@ def setup_logger(name: str,
         level = getattr(logging, level.upper(), logging.INFO)
     logger.setLevel(level)
 
-    # Format
-    fmt = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-    datefmt = "%Y-%m-%d %H:%M:%S"
-    formatter = logging.Formatter(fmt=fmt, datefmt=datefmt)
-
-    # File handler
+    # Sinks (shared, written by the listener thread); the logger's level
+    # already filters what reaches them.
+    sinks = []
     if log_file:
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
-        file_handler = RotatingFileHandler(
-            log_file,
-            maxBytes=_DEFAULT_MAX_MB * 1024 * 1024,
-            backupCount=_DEFAULT_BACKUPS,
-            encoding="utf-8"
-        )
-        file_handler.setFormatter(formatter)
-        file_handler.setLevel(level)
-        logger.addHandler(file_handler)
-
-    # Console handler
+        sinks.append(_file_sink(log_file))
     if to_console:
-        stream_handler = logging.StreamHandler()
-        stream_handler.setFormatter(formatter)
-        stream_handler.setLevel(level)
-        logger.addHandler(stream_handler)
+        sinks.append(_console_sink())
+
+    if sinks:
+        _ensure_listener()
+        logger.addHandler(_SinkQueueHandler(tuple(sinks)))
 
     # Optional: quiet noisy libs
     logging.getLogger("websockets").setLevel(logging.WARNING)
@@ -1,24 +1,50 @@
 # utils/timeframe.py
+_ALIASES = {
+    "1m": ["1m", "1min", "minute1"],
+    "5m": ["5m", "5min", "minute5"],
+    "15m": ["15m", "15min", "minute15"],
+    "30m": ["30m", "30min", "minute30"],
+    "1h": ["1h", "h1", "hour1"],
+    "4h": ["4h", "h4", "hour4"],
+    "8h": ["8h", "hour8"],
+    "12h": ["12h", "hour12"],
+    "1d": ["1d", "day1"],
+    "1w": ["1w", "week1"],
+    "1mth": ["1mth", "month1"],
+}
+
+# Flat alias -> canonical map, built once at import.
+_TF_CANON = {alt: canon for canon, alts in _ALIASES.items() for alt in alts}
+
+
 def normalize_tf(tf: str) -> str:
     """
     Map a bunch of aliases to a canonical key ('1h', '4h', ...).
-    Extend if you add more.
+    Extend _ALIASES if you add more.
     """
+    canon = _TF_CANON.get(tf)
+    if canon is not None:
+        return canon
     t = tf.lower()
-    aliases = {
-        "1m": ["1m", "1min", "minute1"],
-        "5m": ["5m", "5min", "minute5"],
-        "15m": ["15m", "15min", "minute15"],
-        "30m": ["30m", "30min", "minute30"],
-        "1h": ["1h", "h1", "hour1"],
-        "4h": ["4h", "h4", "hour4"],
-        "8h": ["8h", "hour8"],
-        "12h": ["12h", "hour12"],
-        "1d": ["1d", "day1"],
-        "1w": ["1w", "week1"],
-        "1mth": ["1mth", "month1"],
-    }
-    for canon, alts in aliases.items():
-        if t in alts:
-            return canon
-    return t
+    return _TF_CANON.get(t, t)
+
+
+# Bar length of each canonical timeframe (1mth approximated as 30 days).
+_TF_SECONDS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "1h": 3600,
+    "4h": 14400,
+    "8h": 28800,
+    "12h": 43200,
+    "1d": 86400,
+    "1w": 604800,
+    "1mth": 2592000,
+}
+
+
+def tf_seconds(tf: str) -> int:
+    """Bar length in seconds for any alias of a timeframe (0 if unknown)."""
+    return _TF_SECONDS.get(normalize_tf(tf), 0)
@@ -1,15 +1,23 @@
 from datetime import datetime
-import openpyxl
+import atexit
 import os
 import sqlite3
 import json
 import time
 import requests
+import numpy as np
 import pandas as pd
 import logging
+import threading
 from typing import Optional, Dict, Any
 import urllib.parse
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils import json_codec
+from utils.timeframe import tf_seconds
+
 """
 utils/utils.py
 --------------
@@ -17,6 +25,27 @@ Utility helpers. Includes a safe REST kline fetcher that never hard-crashes
 when timeframe maps are missing.
 """
 
+# Connections kept per host by the shared REST session; concurrent REST
+# callers should not exceed it, or requests queue for a free connection.
+HTTP_POOL_MAXSIZE = 32
+
+
+def _make_session() -> requests.Session:
+    """Pooled session for REST reads; retries idempotent GETs with backoff."""
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=frozenset({"GET"}))
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared by all prefill fetches (also from worker threads), so the TLS
+# connection to the API is set up once instead of per call.
+_SESSION = _make_session()
+
+
 def fetch_initial_kline(
     symbol: str,
     interval: str,
@@ -42,10 +71,11 @@ def fetch_initial_kline(
             )
         if not rest_code_map:
             # Last resort: build from env
+            prefix = "REST_TIMEFRAME_CODES_"
             rest_code_map = {
-                k.replace("REST_TIMEFRAME_CODES_", "").lower(): v
+                k[len(prefix):].lower(): v
                 for k, v in os.environ.items()
-                if k.startswith("REST_TIMEFRAME_CODES_")
+                if k.startswith(prefix)
             }
 
     if not rest_code_map:
@@ -68,22 +98,8 @@ def fetch_initial_kline(
     rest_interval = rest_code_map[interval]
 
     base_url = "https://api.lbank.info/v2/kline.do"
-    minutes = {
-        "1m": 1,
-        "5m": 5,
-        "15m": 15,
-        "30m": 30,
-        "1h": 60,
-        "4h": 240,
-        "8h": 480,
-        "12h": 720,
-        "1d": 1440,
-        "1w": 10080,
-        "1mth": 43200,
-    }
-
-    end_time = int(time.time())
-    start_time = end_time - minutes.get(interval, 1) * 60 * size
+    # Bar length from the shared timeframe table (1 minute if unknown).
+    start_time = int(time.time()) - (tf_seconds(interval) or 60) * size
 
     params = {
         "symbol": symbol,
@@ -93,31 +109,30 @@ def fetch_initial_kline(
     }
 
     # log complete REST URL
-    full_url = f"{base_url}?symbol={symbol}&size={size}&type={rest_interval}&time={start_time}"
     if logger:
-        logger.info("⏩ REST GET → %s", full_url)
+        logger.info("⏩ REST GET → %s?symbol=%s&size=%s&type=%s&time=%s",
+                    base_url, symbol, size, rest_interval, start_time)
 
     try:
-        resp = requests.get(base_url, params=params, timeout=10)
+        resp = _SESSION.get(base_url, params=params, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
+        # Parse the raw body (orjson when available) instead of resp.json().
+        data = json_codec.loads(resp.content)
 
         if not data.get("result") or not data.get("data"):
             raise ValueError(f"No data returned for {symbol}-{interval}")
 
-        df = pd.DataFrame(
-            data["data"],
-            columns=["timestamp", "open", "high", "low", "close", "volume"],
-        ).astype(
-            {
-                "timestamp": int,
-                "open": float,
-                "high": float,
-                "low": float,
-                "close": float,
-                "volume": float,
-            }
-        )
+        # One typed conversion of the rows, then wrap the columns without
+        # copying (instead of an object frame plus a cast per column).
+        arr = np.array(data["data"], dtype=np.float64)[:, :6]
+        df = pd.DataFrame({
+            "timestamp": arr[:, 0].astype(np.int64),
+            "open": arr[:, 1],
+            "high": arr[:, 2],
+            "low": arr[:, 3],
+            "close": arr[:, 4],
+            "volume": arr[:, 5],
+        }, copy=False)
         return df
 
     except Exception as e:
@@ -128,37 +143,75 @@ def fetch_initial_kline(
         return pd.DataFrame()
 
 
-def log_signal(msg, file=None):
+# Open append handles of log_signal(), per file name; all are closed when
+# the UTC day changes (new default file) and at exit. Guarded by _LOG_LOCK:
+# blocking message callbacks log from worker threads. Reentrant, since
+# log_signal() closes the handles while holding it.
+_LOG_HANDLES: Dict[str, Any] = {}
+_LOG_DAY = ""
+_LOG_LOCK = threading.RLock()
+
+
+def _close_log_handles() -> None:
+    with _LOG_LOCK:
+        for fh in _LOG_HANDLES.values():
+            fh.close()
+        _LOG_HANDLES.clear()
+
+
+def log_signal(msg: str, file: Optional[str] = None) -> None:
     """
     ثبت پیام در فایل log با فرمت log_YYYY_MM_DD.txt
+    The file stays open between calls instead of being reopened for every
+    message. It is line-buffered, so each signal is flushed as it is
+    written and none are lost if the process dies.
     """
-    if file is None:
-        file = f"log_{datetime.utcnow().strftime('%Y_%m_%d')}.txt"
-    with open(file, "a", encoding="utf-8") as f:
-        f.write(msg + "\n")
+    global _LOG_DAY
+    day = datetime.utcnow().strftime('%Y_%m_%d')
+    with _LOG_LOCK:
+        if day != _LOG_DAY:
+            _close_log_handles()
+            _LOG_DAY = day
+        if file is None:
+            file = f"log_{day}.txt"
+        fh = _LOG_HANDLES.get(file)
+        if fh is None:
+            fh = _LOG_HANDLES[file] = open(file, "a", encoding="utf-8", buffering=1)
+        fh.write(msg + "\n")
 
 
-def save_signal_to_excel(file_path, data):
+_SIGNALS_DB: Optional[sqlite3.Connection] = None
+# The connection is shared across threads (blocking message callbacks run in
+# a pool), so every execute/commit on it happens under _SIGNALS_LOCK.
+_SIGNALS_LOCK = threading.RLock()
+
+
+def _signals_db() -> sqlite3.Connection:
     """
-    ذخیره سیگنال در فایل اکسل
-    data: dict with keys: symbol, interval, timestamp, price, signal
+    Module-wide connection to signals.db, opened on first use and reused.
+    Hold _SIGNALS_LOCK while using it.
     """
-    if os.path.exists(file_path):
-        wb = openpyxl.load_workbook(file_path)
-        ws = wb.active
-    else:
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.append(["Symbol", "Interval", "Timestamp", "Price", "Signal"])
-
-    ws.append([
-        data.get("symbol"),
-        data.get("interval"),
-        data.get("timestamp"),
-        data.get("price"),
-        data.get("signal")
-    ])
-    wb.save(file_path)
+    global _SIGNALS_DB
+    with _SIGNALS_LOCK:
+        if _SIGNALS_DB is None:
+            _SIGNALS_DB = sqlite3.connect("signals.db", check_same_thread=False)
+        return _SIGNALS_DB
+
+
+def _close_signals_db() -> None:
+    global _SIGNALS_DB
+    with _SIGNALS_LOCK:
+        if _SIGNALS_DB is not None:
+            _SIGNALS_DB.close()
+            _SIGNALS_DB = None
+
+
+def _close_at_exit() -> None:
+    _close_log_handles()
+    _close_signals_db()
+
+
+atexit.register(_close_at_exit)
 
 
 def update_dashboard(html_path="dashboard.html", signal_data=None):
@@ -199,17 +252,17 @@ def update_dashboard(html_path="dashboard.html", signal_data=None):
 
     if not signal_data:
         try:
-            conn = sqlite3.connect("signals.db")
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM signals ORDER BY timestamp DESC LIMIT 50")
-            signal_data = cursor.fetchall()
-            conn.close()
-        except:
+            with _SIGNALS_LOCK:
+                signal_data = _signals_db().execute(
+                    "SELECT * FROM signals ORDER BY timestamp DESC LIMIT ?", (50,)
+                ).fetchall()
+        except Exception:
             signal_data = []
 
-    html_signals = ""
-    for row in signal_data[::-1]:  # latest last
-        html_signals += f"<tr><td>{row[0]}</td><td>{row[1]}</td><td>{row[2]}</td><td>{row[3]}</td><td>{row[4]}</td><td>{row[5]}</td></tr>\n"
+    html_signals = "".join(  # latest last
+        f"<tr><td>{row[0]}</td><td>{row[1]}</td><td>{row[2]}</td><td>{row[3]}</td><td>{row[4]}</td><td>{row[5]}</td></tr>\n"
+        for row in reversed(signal_data)
+    )
 
     final_html = html_template.replace("{{SIGNALS}}", html_signals)
     with open(html_path, "w", encoding="utf-8") as f: